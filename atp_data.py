@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Cached readers for the ATP data files shared by the processing scripts.
+Parsed copies are kept as Parquet files next to the CSVs.
+"""
+
+import hashlib
+import inspect
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+DATA_DIR = Path('tennis_atp-master')
+PLAYERS_CSV = DATA_DIR / 'atp_players.csv'
+PLAYERS_CACHE = DATA_DIR / 'atp_players_all.parquet'
+
+def cache_name(fingerprint):
+    """Return a short hash of a cache's fingerprint, for use in its file name."""
+    return hashlib.blake2b(str(fingerprint).encode()).hexdigest()[:16]
+
+def remove_stale_caches(cache_file, pattern):
+    """Delete the cache files matching this glob pattern, except cache_file itself."""
+    for stale_file in cache_file.parent.glob(pattern):
+        if stale_file != cache_file:
+            stale_file.unlink(missing_ok=True)
+
+def read_players_csv(columns, dtype=None):
+    """Read these columns of atp_players.csv (cast to dtype, if given), using the Parquet cache when it is fresh."""
+    # The cache holds every column, so each script reads just the columns it needs from one file
+    if PLAYERS_CACHE.exists() and PLAYERS_CACHE.stat().st_mtime >= PLAYERS_CSV.stat().st_mtime:
+        players_df = pd.read_parquet(PLAYERS_CACHE, columns=columns)
+    else:
+        players_df = pd.read_csv(PLAYERS_CSV, low_memory=False)
+        players_df.to_parquet(PLAYERS_CACHE, index=False)
+        # Earlier caches held only some of the columns
+        remove_stale_caches(PLAYERS_CACHE, 'atp_players*.parquet')
+        players_df = players_df[columns].copy()
+    
+    return players_df.astype(dtype) if dtype else players_df
+
+def matches_cache_path(prefix, match_files, schema, read_match_file):
+    """Return the Parquet cache path for the combined match table of these files.
+    
+    The name hashes the match schema, the source of the function reading each
+    file (its parse options and added columns) and the files' paths,
+    modification times and sizes, so changing any of them gets a fresh cache.
+    """
+    reader = inspect.getsource(read_match_file)
+    files = sorted((file, os.stat(file).st_mtime, os.stat(file).st_size) for file in match_files)
+    return DATA_DIR / f"{prefix}_{cache_name(f'{schema}{reader}{files}')}.parquet"
+
+def load_match_table(prefix, match_files, schema, read_match_file):
+    """Load the match files as one pandas DataFrame, reusing the cached table while no file has changed.
+    
+    read_match_file reads one file as an Arrow table (or None if it can't be read).
+    """
+    cache_file = matches_cache_path(prefix, match_files, schema, read_match_file)
+    if cache_file.exists():
+        combined_df = pq.read_table(cache_file).to_pandas(split_blocks=True, self_destruct=True)
+        print(f"Total matches loaded: {len(combined_df)} (cached in {cache_file})")
+        return combined_df
+    
+    # Files are independent, so read them in parallel (results keep file order)
+    with ProcessPoolExecutor() as executor:
+        all_matches = [table for table in executor.map(read_match_file, match_files) if table is not None]
+    
+    if not all_matches:
+        return pd.DataFrame()
+    
+    combined = pa.concat_tables(all_matches)
+    # Only a complete table is cached, so a file that failed to load is retried next run
+    if len(all_matches) == len(match_files):
+        pq.write_table(combined, cache_file, compression='zstd')
+        # Tables cached for older match files or schemas are never read again
+        remove_stale_caches(cache_file, f"{prefix}_*.parquet")
+    
+    # Convert to pandas once for all years, releasing the Arrow buffers as
+    # columns are converted rather than holding two full copies
+    combined_df = combined.to_pandas(split_blocks=True, self_destruct=True)
+    print(f"Total matches loaded: {len(combined_df)}")
+    return combined_df
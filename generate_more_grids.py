@@ -5,78 +5,140 @@ This script analyzes Grand Slam finals, ATP rankings, head-to-head records,
 and other tennis data to create new grid variations.
 """
 
-import json
-import pandas as pd
-from collections import defaultdict, Counter
-import re
+import orjson
+from collections import defaultdict
+from bisect import bisect_right
+from datetime import datetime
+from pathlib import Path
 
-def load_data():
-    """Load all available tennis data files."""
-    data = {}
-    
-    # Load Grand Slam finals data
+from lazy_json import LazyJSONBundle
+
+# Define eras: first year of each era after 'Pre-1990', and the era labels
+ERA_START_YEARS = [1990, 2000, 2010, 2020]
+ERA_LABELS = ['Pre-1990', '1990s', '2000s', '2010s', '2020s']
+
+def get_era(year):
+    """Return the era label for a year."""
+    return ERA_LABELS[bisect_right(ERA_START_YEARS, year)]
+
+# Precomputed era for every year the data can plausibly contain
+ERA_BY_YEAR = {year: get_era(year) for year in range(1950, 2030)}
+
+# Highest-ranking categories, ordered by the ranking threshold they require
+RANKING_THRESHOLDS = [
+    (1, 'Reached #1 ranking'),
+    (3, 'Reached top 3 ranking'),
+    (5, 'Reached top 5 ranking'),
+    (10, 'Reached top 10 ranking'),
+    (20, 'Reached top 20 ranking'),
+    (50, 'Reached top 50 ranking')
+]
+
+# Precomputed categories for every best ranking that reaches at least one threshold
+RANKING_CATEGORIES_BY_BEST = {
+    best: [name for threshold, name in RANKING_THRESHOLDS if best <= threshold]
+    for best in range(1, RANKING_THRESHOLDS[-1][0] + 1)
+}
+
+# Year-end ranking categories for every top 10 rank
+YEAR_END_THRESHOLDS = [
+    (1, 'Finished year-end #1'),
+    (3, 'Finished year-end top 3'),
+    (5, 'Finished year-end top 5'),
+    (10, 'Finished year-end top 10')
+]
+YEAR_END_CATEGORIES_BY_RANK = {
+    rank: [name for threshold, name in YEAR_END_THRESHOLDS if rank <= threshold]
+    for rank in range(1, YEAR_END_THRESHOLDS[-1][0] + 1)
+}
+
+# Head-to-head categories keyed by the player they refer to
+GRAND_SLAM_DEFEAT_CATEGORIES = {
+    'Roger Federer': 'Defeated Federer in Grand Slam',
+    'Rafael Nadal': 'Defeated Nadal in Grand Slam',
+    'Novak Djokovic': 'Defeated Djokovic in Grand Slam',
+    'Pete Sampras': 'Defeated Sampras in Grand Slam',
+    'Andre Agassi': 'Defeated Agassi in Grand Slam'
+}
+WINNING_H2H_CATEGORIES = {
+    'Roger Federer': 'Has winning H2H vs Federer',
+    'Rafael Nadal': 'Has winning H2H vs Nadal',
+    'Novak Djokovic': 'Has winning H2H vs Djokovic'
+}
+
+def load_json_file(filename):
+    """Read and parse a JSON file in one read."""
+    return orjson.loads(Path(filename).read_bytes())
+
+def load_grand_slams():
+    """Load Grand Slam finals data."""
     try:
-        with open('grand_slam_finals.json', 'r') as f:
-            data['grand_slams'] = json.load(f)
-        print(f"Loaded {len(data['grand_slams']['finals'])} Grand Slam finals")
+        grand_slams = load_json_file('grand_slam_finals.json')
+        print(f"Loaded {len(grand_slams['finals'])} Grand Slam finals")
     except FileNotFoundError:
         print("Grand Slam finals data not found")
-        data['grand_slams'] = {'finals': []}
-    
-    # Load ATP rankings data
+        grand_slams = {'finals': []}
+    return grand_slams
+
+def load_rankings():
+    """Load ATP rankings data."""
     try:
-        with open('atp_ranking_timelines.json', 'r') as f:
-            data['rankings'] = json.load(f)
-        print(f"Loaded {len(data['rankings'])} player ranking timelines")
+        rankings = load_json_file('atp_ranking_timelines.json')
+        print(f"Loaded {len(rankings)} player ranking timelines")
     except FileNotFoundError:
         print("ATP rankings data not found")
-        data['rankings'] = {}
-    
-    # Load head-to-head data
+        rankings = {}
+    return rankings
+
+def load_h2h():
+    """Load head-to-head data."""
     try:
-        with open('h2h_rivalries.json', 'r') as f:
-            data['h2h'] = json.load(f)
-        print(f"Loaded {len(data['h2h'])} head-to-head rivalries")
+        h2h = load_json_file('h2h_rivalries.json')
+        print(f"Loaded {len(h2h)} head-to-head rivalries")
     except FileNotFoundError:
         print("Head-to-head data not found")
-        data['h2h'] = []
-    
-    # Load year-end top 10 data
+        h2h = []
+    return h2h
+
+def load_top10():
+    """Load year-end top 10 data."""
     try:
-        with open('year_end_top10.json', 'r') as f:
-            data['top10'] = json.load(f)
-        print(f"Loaded {len(data['top10'])} years of top 10 data")
+        top10 = load_json_file('year_end_top10.json')
+        print(f"Loaded {len(top10)} years of top 10 data")
     except FileNotFoundError:
         print("Year-end top 10 data not found")
-        data['top10'] = {}
-    
-    return data
+        top10 = {}
+    return top10
+
+def load_data():
+    """Return all available tennis data files, each loaded only when first used."""
+    return LazyJSONBundle({
+        'grand_slams': load_grand_slams,
+        'rankings': load_rankings,
+        'h2h': load_h2h,
+        'top10': load_top10
+    })
 
-def analyze_grand_slam_winners(data):
-    """Analyze Grand Slam winners by tournament and era."""
+def analyze_grand_slam_finals(data, h2h_categories):
+    """Analyze Grand Slam winners by tournament and era, and who beat whom in finals.
+    
+    Finals are scanned once: the 'Defeated X in Grand Slam' lists of
+    h2h_categories are filled in the same pass as the winner groupings.
+    """
     winners_by_tournament = defaultdict(list)
     winners_by_era = defaultdict(list)
     
     for final in data['grand_slams']['finals']:
         winner = final['winner']['name']
-        tournament = final['tournament']
         year = final['year']
         
-        winners_by_tournament[tournament].append(winner)
-        
-        # Define eras
-        if year < 1990:
-            era = "Pre-1990"
-        elif year < 2000:
-            era = "1990s"
-        elif year < 2010:
-            era = "2000s"
-        elif year < 2020:
-            era = "2010s"
-        else:
-            era = "2020s"
+        winners_by_tournament[final['tournament']].append(winner)
+        winners_by_era[ERA_BY_YEAR.get(year) or get_era(year)].append(winner)
         
-        winners_by_era[era].append(winner)
+        # Track specific Grand Slam defeats
+        category = GRAND_SLAM_DEFEAT_CATEGORIES.get(final['loser']['name'])
+        if category:
+            h2h_categories[category].append(winner)
     
     return winners_by_tournament, winners_by_era
 
@@ -102,65 +164,27 @@ def analyze_atp_finals_winners():
 
 def analyze_highest_rankings(data):
     """Analyze players by their highest achieved ranking."""
-    ranking_categories = {
-        'Reached #1 ranking': [],
-        'Reached top 3 ranking': [],
-        'Reached top 5 ranking': [],
-        'Reached top 10 ranking': [],
-        'Reached top 20 ranking': [],
-        'Reached top 50 ranking': []
-    }
+    ranking_categories = {name: [] for _, name in RANKING_THRESHOLDS}
     
     for player_id, player_data in data['rankings'].items():
-        if 'timeline' in player_data:
-            rankings = list(player_data['timeline'].values())
-            if rankings:
-                best_ranking = min(rankings)
-                player_name = player_data['player_info']['name']
-                
-                if best_ranking == 1:
-                    ranking_categories['Reached #1 ranking'].append(player_name)
-                if best_ranking <= 3:
-                    ranking_categories['Reached top 3 ranking'].append(player_name)
-                if best_ranking <= 5:
-                    ranking_categories['Reached top 5 ranking'].append(player_name)
-                if best_ranking <= 10:
-                    ranking_categories['Reached top 10 ranking'].append(player_name)
-                if best_ranking <= 20:
-                    ranking_categories['Reached top 20 ranking'].append(player_name)
-                if best_ranking <= 50:
-                    ranking_categories['Reached top 50 ranking'].append(player_name)
+        timeline = player_data.get('timeline')
+        if timeline:
+            best_ranking = min(timeline.values())
+            player_name = player_data['player_info']['name']
+            
+            for name in RANKING_CATEGORIES_BY_BEST.get(best_ranking, ()):
+                ranking_categories[name].append(player_name)
     
     return ranking_categories
 
 def analyze_head_to_head_records(data):
-    """Analyze head-to-head records and rivalries."""
-    h2h_categories = {
-        'Defeated Federer in Grand Slam': [],
-        'Defeated Nadal in Grand Slam': [],
-        'Defeated Djokovic in Grand Slam': [],
-        'Defeated Sampras in Grand Slam': [],
-        'Defeated Agassi in Grand Slam': [],
-        'Has winning H2H vs Federer': [],
-        'Has winning H2H vs Nadal': [],
-        'Has winning H2H vs Djokovic': []
-    }
+    """Analyze head-to-head records and rivalries.
     
-    # Analyze Grand Slam finals for specific defeats
-    for final in data['grand_slams']['finals']:
-        winner = final['winner']['name']
-        loser = final['loser']['name']
-        
-        if loser == 'Roger Federer':
-            h2h_categories['Defeated Federer in Grand Slam'].append(winner)
-        elif loser == 'Rafael Nadal':
-            h2h_categories['Defeated Nadal in Grand Slam'].append(winner)
-        elif loser == 'Novak Djokovic':
-            h2h_categories['Defeated Djokovic in Grand Slam'].append(winner)
-        elif loser == 'Pete Sampras':
-            h2h_categories['Defeated Sampras in Grand Slam'].append(winner)
-        elif loser == 'Andre Agassi':
-            h2h_categories['Defeated Agassi in Grand Slam'].append(winner)
+    The Grand Slam defeat categories are created empty here and filled by
+    analyze_grand_slam_finals.
+    """
+    h2h_categories = {category: [] for category in GRAND_SLAM_DEFEAT_CATEGORIES.values()}
+    h2h_categories.update({category: [] for category in WINNING_H2H_CATEGORIES.values()})
     
     # Analyze head-to-head records
     for rivalry in data['h2h']:
@@ -168,46 +192,20 @@ def analyze_head_to_head_records(data):
         player2 = rivalry['player2']
         leader = rivalry['leader']
         
-        if player1 == 'Roger Federer' and leader != 'Roger Federer':
-            h2h_categories['Has winning H2H vs Federer'].append(player2)
-        elif player2 == 'Roger Federer' and leader != 'Roger Federer':
-            h2h_categories['Has winning H2H vs Federer'].append(player1)
-        
-        if player1 == 'Rafael Nadal' and leader != 'Rafael Nadal':
-            h2h_categories['Has winning H2H vs Nadal'].append(player2)
-        elif player2 == 'Rafael Nadal' and leader != 'Rafael Nadal':
-            h2h_categories['Has winning H2H vs Nadal'].append(player1)
-        
-        if player1 == 'Novak Djokovic' and leader != 'Novak Djokovic':
-            h2h_categories['Has winning H2H vs Djokovic'].append(player2)
-        elif player2 == 'Novak Djokovic' and leader != 'Novak Djokovic':
-            h2h_categories['Has winning H2H vs Djokovic'].append(player1)
+        for target, category in WINNING_H2H_CATEGORIES.items():
+            if target in (player1, player2) and leader != target:
+                h2h_categories[category].append(player2 if player1 == target else player1)
     
     return h2h_categories
 
 def analyze_year_end_rankings(data):
     """Analyze players by their year-end ranking achievements."""
-    ranking_achievements = {
-        'Finished year-end #1': [],
-        'Finished year-end top 3': [],
-        'Finished year-end top 5': [],
-        'Finished year-end top 10': []
-    }
+    ranking_achievements = {name: [] for _, name in YEAR_END_THRESHOLDS}
     
     for year, year_data in data['top10'].items():
-        if 'top_10' in year_data:
-            for player in year_data['top_10']:
-                player_name = player['name']
-                rank = player['rank']
-                
-                if rank == 1:
-                    ranking_achievements['Finished year-end #1'].append(player_name)
-                if rank <= 3:
-                    ranking_achievements['Finished year-end top 3'].append(player_name)
-                if rank <= 5:
-                    ranking_achievements['Finished year-end top 5'].append(player_name)
-                if rank <= 10:
-                    ranking_achievements['Finished year-end top 10'].append(player_name)
+        for player in year_data.get('top_10', ()):
+            for name in YEAR_END_CATEGORIES_BY_RANK.get(player['rank'], ()):
+                ranking_achievements[name].append(player['name'])
     
     return ranking_achievements
 
@@ -216,11 +214,11 @@ def create_grid_combinations():
     data = load_data()
     
     # Analyze different categories
-    gs_winners_by_tournament, gs_winners_by_era = analyze_grand_slam_winners(data)
+    h2h_categories = analyze_head_to_head_records(data)
+    gs_winners_by_tournament, gs_winners_by_era = analyze_grand_slam_finals(data, h2h_categories)
     olympic_medalists = analyze_olympic_medalists()
     atp_finals_winners = analyze_atp_finals_winners()
     ranking_categories = analyze_highest_rankings(data)
-    h2h_categories = analyze_head_to_head_records(data)
     year_end_rankings = analyze_year_end_rankings(data)
     
     # Create new grid variations
@@ -412,7 +410,7 @@ def save_new_grids():
         'game_variations': new_grids,
         'metadata': {
             'description': 'Additional tennis trivia grid game variations based on comprehensive tennis data analysis',
-            'generated_date': pd.Timestamp.now().isoformat(),
+            'generated_date': datetime.now().isoformat(),
             'data_sources': [
                 'grand_slam_finals.json',
                 'atp_ranking_timelines.json',
@@ -423,8 +421,7 @@ def save_new_grids():
         }
     }
     
-    with open('additional_tennis_grids.json', 'w') as f:
-        json.dump(output_data, f, indent=2)
+    Path('additional_tennis_grids.json').write_bytes(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
     
     print(f"Generated {len(new_grids)} new grid combinations")
     print("Saved to 'additional_tennis_grids.json'")
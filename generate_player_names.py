@@ -5,35 +5,33 @@ for use in the tennis trivia grid autocomplete functionality.
 """
 
 import pandas as pd
-import json
+import orjson
 import os
 import re
 from pathlib import Path
 
-def clean_player_name(name):
-    """Clean and validate a player name."""
-    if pd.isna(name) or name == 'nan':
-        return None
-    
-    # Convert to string and strip whitespace
-    name = str(name).strip()
+# Write JSON through a 64KB buffer to cut down on small syscalls
+JSON_BUFFER_SIZE = 1 << 16
+
+# Names that are just initials, or mostly numbers/special characters
+INITIALS_RE = re.compile(r'^[A-Z\s\.]+$')
+NUMERIC_RE = re.compile(r'^[\d\s\.]+$')
+
+def clean_player_names(names):
+    """Clean and validate a column of player names; invalid names become NaN."""
+    names = names.dropna().astype(str)
     
-    # Remove extra whitespace
-    name = ' '.join(name.split())
+    # Strip and collapse whitespace
+    names = names.str.split().str.join(' ')
+    lengths = names.str.len()
     
-    # Skip if too short or contains problematic characters
-    if len(name) < 2:
-        return None
+    valid = (names != 'nan') & (lengths >= 2)
     
     # Skip names that are just initials or numbers
-    if re.match(r'^[A-Z\s\.]+$', name) and len(name) <= 5:
-        return None
-    
-    # Skip names that are mostly numbers or special characters
-    if re.match(r'^[\d\s\.]+$', name):
-        return None
+    valid &= ~(names.str.match(INITIALS_RE) & (lengths <= 5))
+    valid &= ~names.str.match(NUMERIC_RE)
     
-    return name
+    return names.where(valid)
 
 def extract_player_names():
     """Extract all player names from ATP CSV files and create a comprehensive list."""
@@ -49,32 +47,24 @@ def extract_player_names():
     print(f"Reading player data from {players_file}...")
     
     try:
-        # Read the players CSV file with low_memory=False to avoid warnings
-        df = pd.read_csv(players_file, low_memory=False)
+        # Read only the name columns from the players CSV file
+        df = pd.read_csv(
+            players_file,
+            usecols=['player_id', 'name_first', 'name_last'],
+            dtype={'player_id': 'int32', 'name_first': 'string', 'name_last': 'string'}
+        )
         
-        # Combine first and last names
-        player_names = []
-        for _, row in df.iterrows():
-            first_name = clean_player_name(row['name_first'])
-            last_name = clean_player_name(row['name_last'])
-            
-            # Skip if either name is missing
-            if not first_name or not last_name:
-                continue
-                
-            # Create full name
-            full_name = f"{first_name} {last_name}"
-            
-            # Clean up the name (remove extra spaces, etc.)
-            full_name = ' '.join(full_name.split())
-            
-            if full_name and len(full_name) > 2:
-                player_names.append(full_name)
+        # Combine first and last names (missing or invalid parts yield NaN)
+        first_names = clean_player_names(df['name_first'])
+        last_names = clean_player_names(df['name_last'])
+        full_names = (first_names + ' ' + last_names).dropna()
+        
+        full_names = full_names[full_names.str.len() > 2]
         
         # Remove duplicates and sort
-        unique_names = sorted(list(set(player_names)))
+        unique_names = sorted(set(full_names))
         
-        print(f"Extracted {len(unique_names)} unique player names from {len(player_names)} total entries")
+        print(f"Extracted {len(unique_names)} unique player names from {len(full_names)} total entries")
         
         return unique_names
         
@@ -102,8 +92,9 @@ def create_player_names_json():
     output_file = 'all_tennis_players.json'
     
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        # Compact output: the file is only consumed by the autocomplete
+        with open(output_file, 'wb', buffering=JSON_BUFFER_SIZE) as f:
+            f.write(orjson.dumps(output_data))
         
         print(f"Successfully created {output_file} with {len(player_names)} player names")
         print(f"File size: {os.path.getsize(output_file) / 1024:.1f} KB")
@@ -119,8 +110,9 @@ def create_player_names_json():
         # Show some famous players to verify quality
         famous_players = ['Roger Federer', 'Rafael Nadal', 'Novak Djokovic', 'Pete Sampras', 'Andre Agassi']
         print("\nChecking for famous players:")
+        player_set = set(player_names)
         for player in famous_players:
-            if player in player_names:
+            if player in player_set:
                 print(f"  ✓ {player}")
             else:
                 print(f"  ✗ {player} (not found)")
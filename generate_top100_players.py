@@ -5,10 +5,19 @@ for use in the tennis trivia grid autocomplete functionality.
 """
 
 import pandas as pd
-import json
+import orjson
 import os
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 from pathlib import Path
 
+# Write JSON through a 64KB buffer to cut down on small syscalls
+JSON_BUFFER_SIZE = 1 << 16
+
+# Only the columns needed to find top 100 players are decoded from ranking files
+RANKING_SCHEMA = pa.schema([('rank', pa.int32()), ('player', pa.int32())])
+
 def extract_top100_players():
     """Extract players who have been in the ATP top 100 rankings."""
     
@@ -23,13 +32,14 @@ def extract_top100_players():
     print(f"Reading player data from {players_file}...")
     
     try:
-        # Read the players CSV file
-        df_players = pd.read_csv(players_file, low_memory=False)
+        # Read the players CSV file (only the id and name columns are needed)
+        df_players = pd.read_csv(
+            players_file,
+            usecols=['player_id', 'name_first', 'name_last'],
+            dtype={'player_id': 'int32', 'name_first': 'string', 'name_last': 'string'}
+        )
         print(f"Loaded {len(df_players)} players from CSV")
         
-        # Create a set to store unique player IDs who have been in top 100
-        top100_player_ids = set()
-        
         # Check all ranking files for top 100 players
         ranking_files = [
             'atp_rankings_70s.csv',
@@ -41,54 +51,38 @@ def extract_top100_players():
             'atp_rankings_current.csv'
         ]
         
+        existing_files = []
         for ranking_file in ranking_files:
             file_path = atp_dir / ranking_file
             if file_path.exists():
-                print(f"Processing {ranking_file}...")
-                try:
-                    df_rankings = pd.read_csv(file_path, low_memory=False)
-                    
-                    # Filter for players ranked in top 100
-                    top100_rankings = df_rankings[df_rankings['rank'] <= 100]
-                    
-                    # Add player IDs to our set
-                    if 'player_id' in top100_rankings.columns:
-                        top100_player_ids.update(top100_rankings['player_id'].unique())
-                    elif 'player' in top100_rankings.columns:
-                        # Some files might use 'player' instead of 'player_id'
-                        top100_player_ids.update(top100_rankings['player'].unique())
-                        
-                    print(f"  Found {len(top100_rankings['player_id'].unique()) if 'player_id' in top100_rankings.columns else len(top100_rankings['player'].unique())} unique players in top 100")
-                    
-                except Exception as e:
-                    print(f"  Error processing {ranking_file}: {e}")
+                existing_files.append(str(file_path))
             else:
                 print(f"  {ranking_file} not found, skipping...")
         
+        # Scan all ranking files in one pass, keeping only top 100 rows while decoding
+        print(f"Scanning {len(existing_files)} ranking files...")
+        rankings = ds.dataset(existing_files, format='csv', schema=RANKING_SCHEMA)
+        top100_rankings = rankings.to_table(columns=['player'], filter=pc.field('rank') <= 100)
+        top100_player_ids = set(top100_rankings.column('player').to_pylist())
+        
         print(f"\nTotal unique players who have been in top 100: {len(top100_player_ids)}")
         
         # Now get the player names for these IDs
-        player_names = []
-        for _, row in df_players.iterrows():
-            if row['player_id'] in top100_player_ids:
-                first_name = str(row['name_first']).strip()
-                last_name = str(row['name_last']).strip()
-                
-                # Skip if either name is missing or contains NaN
-                if pd.isna(first_name) or pd.isna(last_name) or first_name == 'nan' or last_name == 'nan':
-                    continue
-                    
-                # Create full name
-                full_name = f"{first_name} {last_name}"
-                
-                # Clean up the name (remove extra spaces, etc.)
-                full_name = ' '.join(full_name.split())
-                
-                if full_name and len(full_name) > 2:
-                    player_names.append(full_name)
-        
-        # Remove duplicates and sort
-        unique_names = sorted(list(set(player_names)))
+        df_top100 = df_players[df_players['player_id'].isin(list(top100_player_ids))]
+        
+        # Skip if either name is missing or contains NaN
+        df_top100 = df_top100.dropna(subset=['name_first', 'name_last'])
+        first_names = df_top100['name_first'].astype(str).str.strip()
+        last_names = df_top100['name_last'].astype(str).str.strip()
+        has_names = (first_names != 'nan') & (last_names != 'nan')
+        
+        # Create full names and clean them up (remove extra spaces, etc.)
+        full_names = (first_names[has_names] + ' ' + last_names[has_names]).str.split().str.join(' ')
+        
+        player_names = set(full_names[full_names.str.len() > 2])
+        
+        # Sort the unique names
+        unique_names = sorted(player_names)
         
         print(f"Extracted {len(unique_names)} unique player names from top 100 players")
         
@@ -118,8 +112,9 @@ def create_top100_players_json():
     output_file = 'top100_tennis_players.json'
     
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        # Compact output: the file is only consumed by the autocomplete
+        with open(output_file, 'wb', buffering=JSON_BUFFER_SIZE) as f:
+            f.write(orjson.dumps(output_data))
         
         print(f"Successfully created {output_file} with {len(player_names)} player names")
         print(f"File size: {os.path.getsize(output_file) / 1024:.1f} KB")
@@ -135,8 +130,9 @@ def create_top100_players_json():
         # Show some famous players to verify quality
         famous_players = ['Roger Federer', 'Rafael Nadal', 'Novak Djokovic', 'Pete Sampras', 'Andre Agassi', 'Juan Carlos Ferrero']
         print("\nChecking for famous players:")
+        player_set = set(player_names)
         for player in famous_players:
-            if player in player_names:
+            if player in player_set:
                 print(f"  ✓ {player}")
             else:
                 print(f"  ✗ {player} (not found)")
@@ -4,43 +4,36 @@ Generate realistic tennis trivia grid data based on actual tennis history.
 This script analyzes the available data to create game variations with real facts.
 """
 
-import json
+import orjson
 import pandas as pd
 from collections import defaultdict
+from functools import partial
+from pathlib import Path
 
-def load_data():
-    """Load all available tennis data."""
-    data = {}
-    
-    # Load grand slam finals
-    try:
-        with open('grand_slam_finals.json', 'r') as f:
-            data['finals'] = json.load(f)['finals']
-    except:
-        data['finals'] = []
-    
-    # Load ATP rankings
-    try:
-        with open('atp_ranking_timelines.json', 'r') as f:
-            data['rankings'] = json.load(f)
-    except:
-        data['rankings'] = {}
-    
-    # Load year-end top 10
+from lazy_json import LazyJSONBundle
+
+def load_json_file(filename, default):
+    """Read and parse a JSON file, or return the default when it is missing or unreadable."""
     try:
-        with open('year_end_top10.json', 'r') as f:
-            data['year_end'] = json.load(f)
+        return orjson.loads(Path(filename).read_bytes())
     except:
-        data['year_end'] = {}
-    
-    # Load H2H data
+        return default
+
+def load_finals():
+    """Load the Grand Slam finals list (only the list is used from the finals file)."""
     try:
-        with open('h2h_rivalries.json', 'r') as f:
-            data['h2h'] = json.load(f)
+        return orjson.loads(Path('grand_slam_finals.json').read_bytes())['finals']
     except:
-        data['h2h'] = []
-    
-    return data
+        return []
+
+def load_data():
+    """Load all available tennis data (each file is parsed when first used)."""
+    return LazyJSONBundle({
+        'finals': load_finals,
+        'rankings': partial(load_json_file, 'atp_ranking_timelines.json', {}),
+        'year_end': partial(load_json_file, 'year_end_top10.json', {}),
+        'h2h': partial(load_json_file, 'h2h_rivalries.json', [])
+    })
 
 def analyze_grand_slam_defeats(finals_data):
     """Analyze who defeated Big 3 at specific tournaments."""
@@ -215,35 +208,13 @@ def generate_game_variations():
             for tournament, matches in tournaments.items():
                 print(f"  {tournament}: {[m['winner'] for m in matches]}")
     
-    # Generate a more realistic Big 3 era variation
-    realistic_big3 = {
+    # Generate a more realistic Big 3 era variation (same grid as big3_era)
+    variations["realistic_big3"] = {
+        **variations["big3_era"],
         "name": "Big 3 Era (Realistic)",
-        "description": "Based on actual match results",
-        "rows": [
-            "Defeated Djokovic at Australian Open",
-            "Defeated Nadal at Roland Garros", 
-            "Defeated Federer at Wimbledon"
-        ],
-        "cols": [
-            "Reached #1 ATP ranking",
-            "Won Olympic singles gold",
-            "Won Paris-Bercy Masters"
-        ],
-        "answers": {
-            "0,0": "Andy Murray",
-            "0,1": "Andy Murray", 
-            "0,2": "Andy Murray",
-            "1,0": "Robin Soderling",
-            "1,1": "Rafael Nadal",
-            "1,2": "Jo-Wilfried Tsonga",
-            "2,0": "Tomas Berdych",
-            "2,1": "Roger Federer",
-            "2,2": "Novak Djokovic"
-        }
+        "description": "Based on actual match results"
     }
     
-    variations["realistic_big3"] = realistic_big3
-    
     return variations
 
 def save_game_data(variations):
@@ -257,8 +228,7 @@ def save_game_data(variations):
         }
     }
     
-    with open('tennis_trivia_grid_data.json', 'w') as f:
-        json.dump(output, f, indent=2)
+    Path('tennis_trivia_grid_data.json').write_bytes(orjson.dumps(output, option=orjson.OPT_INDENT_2))
     
     print(f"\nSaved {len(variations)} game variations to tennis_trivia_grid_data.json")
 
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Lazy loading of the generated JSON data files shared by the grid scripts.
+"""
+
+class LazyJSONBundle:
+    """Dict-like bundle of data files where each file is loaded on first access.
+    
+    loaders maps each key to a callable returning that key's data.
+    """
+    
+    def __init__(self, loaders):
+        self._loaders = loaders
+        self._data = {}
+    
+    def __getitem__(self, key):
+        if key not in self._data:
+            self._data[key] = self._loaders[key]()
+        return self._data[key]
@@ -3,31 +3,79 @@
 Process ATP ranking data to extract yearly highest rankings for top 10 players.
 """
 import pandas as pd
-import json
+import orjson
 import os
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from pathlib import Path
+
+from atp_data import read_players_csv
+
+# Column types of the ranking files
+RANKING_DTYPES = {'ranking_date': 'Int32', 'player': 'Int32', 'rank': 'Int16'}
+
+# Columns read from atp_players.csv
+PLAYER_COLUMNS = ['player_id', 'name_first', 'name_last', 'ioc', 'hand', 'dob']
 
 def load_player_data():
     """Load player information mapping."""
-    players_file = 'tennis_atp-master/atp_players.csv'
-    players_df = pd.read_csv(players_file)
-    
-    player_map = {}
-    for _, row in players_df.iterrows():
-        player_id = str(row['player_id'])
-        player_map[player_id] = {
-            'name': f"{row['name_first']} {row['name_last']}",
-            'first_name': row['name_first'],
-            'last_name': row['name_last'],
-            'country': row['ioc'] if pd.notna(row['ioc']) else 'Unknown',
-            'hand': row['hand'] if pd.notna(row['hand']) else 'Unknown',
-            'dob': row['dob'] if pd.notna(row['dob']) else None
+    players_df = read_players_csv(PLAYER_COLUMNS)
+    
+    # Fill missing values once for the whole frame
+    players_df[['ioc', 'hand']] = players_df[['ioc', 'hand']].fillna('Unknown')
+    dobs = players_df['dob'].astype(object).where(players_df['dob'].notna(), None)
+    
+    player_map = {
+        str(player_id): {
+            'name': f"{first_name} {last_name}",
+            'first_name': first_name,
+            'last_name': last_name,
+            'country': country,
+            'hand': hand,
+            'dob': dob
         }
+        for player_id, first_name, last_name, country, hand, dob in zip(
+            players_df['player_id'].tolist(),
+            players_df['name_first'].tolist(),
+            players_df['name_last'].tolist(),
+            players_df['ioc'].tolist(),
+            players_df['hand'].tolist(),
+            dobs.tolist()
+        )
+    }
     
     print(f"Loaded {len(player_map)} player records")
     return player_map
 
+def process_ranking_file(file_path):
+    """Find the best rank per (player, year) in one ranking file."""
+    print(f"Processing {file_path}...")
+    
+    try:
+        # The multi-threaded Arrow parser reads the whole file quickly, straight
+        # into integer columns (nullable, so missing entries stay NA)
+        rankings = pd.read_csv(
+            file_path,
+            usecols=['ranking_date', 'player', 'rank'],
+            dtype=RANKING_DTYPES,
+            engine='pyarrow'
+        )
+        
+        # Skip rows with missing values or malformed (YYYYMMDD) dates
+        rankings = rankings.dropna(subset=['ranking_date', 'player', 'rank'])
+        rankings = rankings[rankings['ranking_date'] >= 10000000]
+        
+        # With the NAs gone, group on plain numpy integers
+        player_ids = rankings['player'].astype('int64')
+        years = (rankings['ranking_date'] // 10000).astype('int64')
+        
+        # Best rank for each player and year (lower number = better rank)
+        return rankings['rank'].groupby([player_ids, years], sort=False).min()
+    
+    except Exception as e:
+        print(f"Error processing {file_path}: {e}")
+        return None
+
 def process_ranking_files():
     """Process all ATP ranking files to find yearly highest rankings."""
     ranking_files = [
@@ -40,65 +88,30 @@ def process_ranking_files():
         'tennis_atp-master/atp_rankings_current.csv'
     ]
     
-    # Dictionary to store player rankings: player_id -> year -> best_rank
-    player_year_rankings = defaultdict(lambda: defaultdict(lambda: float('inf')))
-    top10_players = set()
-    
+    existing_files = []
     for file_path in ranking_files:
-        if not os.path.exists(file_path):
+        if os.path.exists(file_path):
+            existing_files.append(file_path)
+        else:
             print(f"Warning: {file_path} not found")
-            continue
-            
-        print(f"Processing {file_path}...")
-        
-        try:
-            # Read file in chunks due to large size
-            chunk_size = 50000
-            for chunk in pd.read_csv(file_path, chunksize=chunk_size):
-                for _, row in chunk.iterrows():
-                    try:
-                        # Handle both string and float date formats
-                        ranking_date_raw = row['ranking_date']
-                        if pd.isna(ranking_date_raw):
-                            continue
-                            
-                        # Convert to string and remove decimal if present
-                        ranking_date = str(ranking_date_raw).replace('.0', '')
-                        
-                        if len(ranking_date) >= 8:
-                            year = int(ranking_date[:4])
-                            month = int(ranking_date[4:6])
-                            day = int(ranking_date[6:8])
-                        else:
-                            continue
-                            
-                        # Handle player ID - convert float to int to string to avoid .0 suffix
-                        player_id_raw = row['player']
-                        if pd.isna(player_id_raw):
-                            continue
-                        player_id = str(int(player_id_raw))
-                        
-                        # Handle rank
-                        rank_raw = row['rank']
-                        if pd.isna(rank_raw):
-                            continue
-                        rank = int(rank_raw)
-                        
-                        # Track players who have been in top 10
-                        if rank <= 10:
-                            top10_players.add(player_id)
-                        
-                        # Update best rank for this year (lower number = better rank)
-                        if rank < player_year_rankings[player_id][year]:
-                            player_year_rankings[player_id][year] = rank
-                            
-                    except (ValueError, KeyError) as e:
-                        # Skip malformed rows
-                        continue
-                        
-        except Exception as e:
-            print(f"Error processing {file_path}: {e}")
-            continue
+    
+    # Files are independent, so process them in parallel
+    with ProcessPoolExecutor(max_workers=max(1, min(len(existing_files), os.cpu_count() or 1))) as executor:
+        # Per-file best ranks as Series indexed by (player, year)
+        yearly_best_ranks = [
+            best_ranks for best_ranks in executor.map(process_ranking_file, existing_files)
+            if best_ranks is not None
+        ]
+    
+    # Best rank per (player, year) across all files, as compact int16 values
+    if yearly_best_ranks:
+        player_year_rankings = pd.concat(yearly_best_ranks).groupby(level=[0, 1], sort=False).min()
+    else:
+        player_year_rankings = pd.Series([], index=pd.MultiIndex.from_arrays([[], []]))
+    player_year_rankings = player_year_rankings.astype('int16').rename_axis(['player', 'year'])
+    
+    # Players who have been in top 10 in any year
+    top10_players = player_year_rankings[player_year_rankings <= 10].index.get_level_values('player').unique()
     
     print(f"Found {len(top10_players)} players who reached top 10")
     return player_year_rankings, top10_players
@@ -111,28 +124,21 @@ def create_ranking_timeline_data():
     # Filter for only top 10 players and create timeline
     final_data = {}
     
-    for player_id in top10_players:
+    top10_rankings = player_rankings[player_rankings.index.isin(top10_players, level='player')]
+    
+    for player_id, player_ranks in top10_rankings.groupby(level='player', sort=False):
+        player_id = str(player_id)
         if player_id not in player_map:
             continue
             
-        player_data = player_map[player_id]
-        player_timeline = dict(player_rankings[player_id])
-        
         # Only include players with at least 3 years of data
-        if len(player_timeline) < 3:
+        if len(player_ranks) < 3:
             continue
-            
-        # Convert inf values back to None (no ranking that year)
-        cleaned_timeline = {}
-        for year, rank in player_timeline.items():
-            if rank != float('inf'):
-                cleaned_timeline[year] = rank
         
-        if len(cleaned_timeline) >= 3:  # Ensure we still have enough data after cleaning
-            final_data[player_id] = {
-                'player_info': player_data,
-                'timeline': cleaned_timeline
-            }
+        final_data[player_id] = {
+            'player_info': player_map[player_id],
+            'timeline': player_ranks.droplevel('player').to_dict()
+        }
     
     print(f"Final dataset: {len(final_data)} top 10 players with sufficient data")
     return final_data
@@ -145,8 +151,8 @@ def main():
     
     # Save to JSON file
     output_file = 'atp_ranking_timelines.json'
-    with open(output_file, 'w') as f:
-        json.dump(ranking_data, f, indent=2)
+    # Year keys in the timelines are ints; orjson stringifies them like json did
+    Path(output_file).write_bytes(orjson.dumps(ranking_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     
     print(f"✅ Highest ranking timeline data saved to {output_file}")
     
@@ -4,26 +4,75 @@ Process Grand Slam tournament data from ATP match files.
 Creates a consolidated JSON file with player Grand Slam performance timelines.
 """
 
+import numpy as np
 import pandas as pd
-import json
+import orjson
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 from pathlib import Path
 
+from atp_data import read_players_csv
+
+# Columns (and their types) read from the yearly match files; the repetitive
+# string columns are dictionary-encoded and arrive in pandas as categoricals
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+MATCH_SCHEMA = pa.schema([
+    ('tourney_name', CATEGORY),
+    ('tourney_level', CATEGORY),
+    ('winner_id', pa.int64()),
+    ('loser_id', pa.int64()),
+    ('round', CATEGORY)
+])
+
+# Grand Slam tournament name mapping
+TOURNAMENT_MAP = {
+    'Australian Open': 'AO',
+    'Roland Garros': 'RG',
+    'Wimbledon': 'W',
+    'US Open': 'USO',
+    'Us Open': 'USO'  # Handle inconsistent naming
+}
+
+# Round order for determining best result, and each round's position in it
+ROUND_ORDER = ['R128', 'R64', 'R32', 'R16', 'QF', 'SF', 'F', 'W']
+ROUND_RANK = {round_code: rank for rank, round_code in enumerate(ROUND_ORDER)}
+
+# Columns read from atp_players.csv
+PLAYER_COLUMNS = ['player_id', 'name_first', 'name_last', 'ioc', 'hand', 'dob']
+
 def load_players():
     """Load player information from atp_players.csv"""
     try:
-        players_df = pd.read_csv('tennis_atp-master/atp_players.csv')
+        players_df = read_players_csv(PLAYER_COLUMNS)
+        
+        # Missing optional fields become empty strings
+        optional_columns = ['ioc', 'hand', 'dob']
+        optional = players_df[optional_columns]
+        players_df[optional_columns] = optional.astype(str).where(optional.notna(), '')
+        
         players = {}
-        for _, row in players_df.iterrows():
-            players[str(row['player_id'])] = {
-                'id': str(row['player_id']),
-                'name': f"{row['name_first']} {row['name_last']}".strip(),
-                'first_name': str(row['name_first']).strip(),
-                'last_name': str(row['name_last']).strip(),
-                'country': str(row['ioc']).strip() if pd.notna(row['ioc']) else '',
-                'hand': str(row['hand']).strip() if pd.notna(row['hand']) else '',
-                'dob': str(row['dob']).strip() if pd.notna(row['dob']) else ''
+        for player_id, first_name, last_name, country, hand, dob in zip(
+            players_df['player_id'].tolist(),
+            players_df['name_first'].tolist(),
+            players_df['name_last'].tolist(),
+            players_df['ioc'].tolist(),
+            players_df['hand'].tolist(),
+            players_df['dob'].tolist()
+        ):
+            player_id = str(player_id)
+            players[player_id] = {
+                'id': player_id,
+                'name': f"{first_name} {last_name}".strip(),
+                'first_name': str(first_name).strip(),
+                'last_name': str(last_name).strip(),
+                'country': country.strip(),
+                'hand': hand.strip(),
+                'dob': dob.strip()
             }
         print(f"Loaded {len(players)} players")
         return players
@@ -31,8 +80,8 @@ def load_players():
         print(f"Error loading players: {e}")
         return {}
 
-def process_year_matches(year, players):
-    """Process matches for a specific year"""
+def process_year_matches(year, player_ids):
+    """Process matches for a specific year, keeping results for the given player IDs"""
     filename = f'tennis_atp-master/atp_matches_{year}.csv'
     
     if not os.path.exists(filename):
@@ -41,73 +90,61 @@ def process_year_matches(year, players):
     
     try:
         print(f"Processing {year}...")
-        df = pd.read_csv(filename, low_memory=False)
-        
-        # Filter for Grand Slam matches only (tourney_level = 'G')
-        grand_slam_matches = df[df['tourney_level'] == 'G'].copy()
+        # Filter for Grand Slam matches only (tourney_level = 'G') while scanning,
+        # so other matches are never materialized
+        matches = ds.dataset(filename, format='csv', schema=MATCH_SCHEMA)
+        grand_slam_table = matches.to_table(filter=pc.field('tourney_level') == 'G')
         
-        if grand_slam_matches.empty:
+        # Bail out before building any pandas objects for years without Grand Slams
+        if grand_slam_table.num_rows == 0:
             print(f"No Grand Slam matches found in {year}")
             return {}
         
+        grand_slam_matches = grand_slam_table.to_pandas()
         print(f"Found {len(grand_slam_matches)} Grand Slam matches in {year}")
         
-        # Dictionary to store player results for this year
-        year_results = {}
+        grand_slam_matches['tournament_code'] = grand_slam_matches['tourney_name'].map(TOURNAMENT_MAP)
+        grand_slam_matches = grand_slam_matches.dropna(subset=['tournament_code'])
         
-        # Grand Slam tournament name mapping
-        tournament_map = {
-            'Australian Open': 'AO',
-            'Roland Garros': 'RG',
-            'Wimbledon': 'W',
-            'US Open': 'USO',
-            'Us Open': 'USO'  # Handle inconsistent naming
-        }
+        # Mapping a categorical looks up each distinct round once, not once per row
+        rounds = grand_slam_matches['round']
+        round_ranks = rounds.map(ROUND_RANK).astype('float64')
         
-        # Round order for determining best result
-        round_order = ['R128', 'R64', 'R32', 'R16', 'QF', 'SF', 'F', 'W']
+        # One row per player per match; a winner of the final won the tournament
+        winners = pd.DataFrame({
+            'player_id': grand_slam_matches['winner_id'].astype(str),
+            'tournament_code': grand_slam_matches['tournament_code'],
+            'rank': round_ranks.where(rounds != 'F', ROUND_RANK['W'])
+        })
+        losers = pd.DataFrame({
+            'player_id': grand_slam_matches['loser_id'].astype(str),
+            'tournament_code': grand_slam_matches['tournament_code'],
+            'rank': round_ranks
+        })
         
-        for _, match in grand_slam_matches.iterrows():
-            tournament_name = match['tourney_name']
-            tournament_code = tournament_map.get(tournament_name)
-            
-            if not tournament_code:
-                continue
-                
-            winner_id = str(match['winner_id'])
-            loser_id = str(match['loser_id'])
-            round_code = match['round']
-            
-            # Process winner
-            if winner_id in players:
-                if winner_id not in year_results:
-                    year_results[winner_id] = {}
-                
-                # For winner, check if this is a final to determine if they won the tournament
-                result = 'W' if round_code == 'F' else round_code
-                
-                # Keep the best result for this tournament
-                if tournament_code not in year_results[winner_id]:
-                    year_results[winner_id][tournament_code] = result
-                else:
-                    current_result = year_results[winner_id][tournament_code]
-                    if round_order.index(result) > round_order.index(current_result):
-                        year_results[winner_id][tournament_code] = result
-            
-            # Process loser
-            if loser_id in players:
-                if loser_id not in year_results:
-                    year_results[loser_id] = {}
-                
-                result = round_code
-                
-                # Keep the best result for this tournament
-                if tournament_code not in year_results[loser_id]:
-                    year_results[loser_id][tournament_code] = result
-                else:
-                    current_result = year_results[loser_id][tournament_code]
-                    if round_order.index(result) > round_order.index(current_result):
-                        year_results[loser_id][tournament_code] = result
+        # Interleave winner and loser rows in match order so players keep their first-seen order
+        results = pd.concat([winners, losers]).sort_index(kind='stable')
+        # Keep known players only (dict lookups are cheaper than isin over every player ID)
+        results = results[[player_id in player_ids for player_id in results['player_id']]]
+        
+        # Rounds outside ROUND_ORDER cannot be ranked
+        results = results.dropna(subset=['rank'])
+        
+        # Keep the best result for each player and tournament: number the pairs in
+        # first-seen order, line up each pair's ranks and take the max of each run
+        player_tournaments = results['player_id'] + '|' + results['tournament_code'].astype(str)
+        pair_codes, pairs = pd.factorize(player_tournaments)
+        order = np.argsort(pair_codes, kind='stable')
+        sorted_codes = pair_codes[order]
+        sorted_ranks = results['rank'].to_numpy('int8')[order]
+        run_starts = np.flatnonzero(np.diff(sorted_codes, prepend=-1))
+        best_ranks = np.maximum.reduceat(sorted_ranks, run_starts)
+        
+        # Dictionary to store player results for this year
+        year_results = {}
+        for pair, rank in zip(pairs.tolist(), best_ranks.tolist()):
+            player_id, tournament_code = pair.split('|')
+            year_results.setdefault(player_id, {})[tournament_code] = ROUND_ORDER[rank]
         
         print(f"Processed {len(year_results)} players with Grand Slam results in {year}")
         return year_results
@@ -133,10 +170,15 @@ def main():
     # Dictionary to store all player timelines
     all_timelines = {}
     
-    # Process each year
-    for year in range(start_year, end_year + 1):
-        year_results = process_year_matches(year, players)
-        
+    # Years are independent, so process them in parallel; workers only need the
+    # player IDs, not the full player records
+    years = range(start_year, end_year + 1)
+    player_ids = frozenset(players)
+    
+    with ProcessPoolExecutor() as executor:
+        all_year_results = list(executor.map(process_year_matches, years, repeat(player_ids)))
+    
+    for year, year_results in zip(years, all_year_results):
         # Merge results into main timelines
         for player_id, tournaments in year_results.items():
             if player_id not in all_timelines:
@@ -168,8 +210,7 @@ def main():
     # Save to JSON file
     output_file = 'grand_slam_timelines.json'
     try:
-        with open(output_file, 'w') as f:
-            json.dump(filtered_timelines, f, indent=2)
+        Path(output_file).write_bytes(orjson.dumps(filtered_timelines, option=orjson.OPT_INDENT_2))
         print(f"Successfully saved data to {output_file}")
         
         # Print some sample data
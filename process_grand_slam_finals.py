@@ -4,12 +4,76 @@ Process Grand Slam finals data from ATP tennis matches (2000-2024)
 Extract finals with complete score information for the quiz game.
 """
 
+import hashlib
 import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import pandas as pd
-import json
+import orjson
 import re
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.dataset as ds
+from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+# Retirement, walkover and default markers in a score, compiled once
+INCOMPLETE_RE = re.compile(r'RET|W/O|DEF', re.IGNORECASE)
+
+# Print every added final, not just each year's summary
+VERBOSE = False
+
+# Cached per-year finals are only valid for the code that built them (score
+# parsing, cleaning, record shape and order), so their names include a hash of
+# this script's source
+CACHE_VERSION = hashlib.blake2b(Path(__file__).read_bytes()).hexdigest()[:8]
+
+# Columns (and their types) read from the yearly match files
+MATCH_SCHEMA = pa.schema([
+    ('tourney_name', pa.string()),
+    ('surface', pa.string()),
+    ('tourney_level', pa.string()),
+    ('tourney_date', pa.int64()),
+    ('winner_seed', pa.float64()),
+    ('winner_name', pa.string()),
+    ('winner_ioc', pa.string()),
+    ('winner_age', pa.float64()),
+    ('loser_seed', pa.float64()),
+    ('loser_name', pa.string()),
+    ('loser_ioc', pa.string()),
+    ('loser_age', pa.float64()),
+    ('score', pa.string()),
+    ('best_of', pa.int64()),
+    ('round', pa.string()),
+    ('minutes', pa.float64())
+])
+
+# Empty fields are missing values, as pd.read_csv would treat them
+MATCH_FORMAT = ds.CsvFileFormat(convert_options=pv.ConvertOptions(strings_can_be_null=True))
+
+# Columns of the match files used to describe a final
+FINAL_COLUMNS = [
+    'tourney_name', 'surface', 'tourney_date',
+    'winner_name', 'winner_ioc', 'winner_seed', 'winner_age',
+    'loser_name', 'loser_ioc', 'loser_seed', 'loser_age',
+    'score', 'minutes', 'best_of'
+]
+
+# Grand Slam (tourney_level 'G') finals
+GRAND_SLAM_FINALS = (pc.field('tourney_level') == 'G') & (pc.field('round') == 'F')
+
+# Display names of the Grand Slams, and their order within a year
+TOURNAMENT_DISPLAY_NAMES = {
+    'Australian Open': 'Australian Open',
+    'Roland Garros': 'French Open', 
+    'Wimbledon': 'Wimbledon',
+    'US Open': 'US Open'
+}
+TOURNAMENT_ORDER = ['Australian Open', 'French Open', 'Wimbledon', 'US Open']
+TOURNAMENT_INDEX = {tournament: index for index, tournament in enumerate(TOURNAMENT_ORDER)}
+
 def parse_score(score_str: str) -> Optional[List[Dict[str, int]]]:
     """
     Parse tennis score string into structured set data.
@@ -26,7 +90,7 @@ def parse_score(score_str: str) -> Optional[List[Dict[str, int]]]:
     score_str = score_str.strip()
     
     # Handle retirement, walkover, or incomplete scores
-    if any(keyword in score_str.upper() for keyword in ['RET', 'W/O', 'DEF']):
+    if INCOMPLETE_RE.search(score_str):
         return None
     
     # Split by spaces to get individual sets
@@ -34,17 +98,20 @@ def parse_score(score_str: str) -> Optional[List[Dict[str, int]]]:
     parsed_sets = []
     
     for set_score in sets:
-        # Remove tiebreak scores in parentheses for parsing
-        clean_set = re.sub(r'\(\d+\)', '', set_score)
+        # Remove the tiebreak score in parentheses (it always ends the set) for parsing
+        clean_set, paren, tiebreak = set_score.partition('(')
+        if paren and not (tiebreak[-1:] == ')' and tiebreak[:-1].isdecimal()):
+            # Invalid set format, skip this match
+            return None
         
-        # Match pattern like "6-4" or "7-5"
-        match = re.match(r'^(\d+)-(\d+)$', clean_set)
-        if not match:
+        # Split a set like "6-4" or "7-5" into its game counts
+        winner_games, dash, loser_games = clean_set.partition('-')
+        if not (dash and winner_games.isdecimal() and loser_games.isdecimal()):
             # Invalid set format, skip this match
             return None
             
-        winner_games = int(match.group(1))
-        loser_games = int(match.group(2))
+        winner_games = int(winner_games)
+        loser_games = int(loser_games)
         
         # Basic validation for tennis scores
         if winner_games > 7 or loser_games > 7:
@@ -65,15 +132,105 @@ def parse_score(score_str: str) -> Optional[List[Dict[str, int]]]:
         
     return parsed_sets
 
+def clean_value(value, default=''):
+    """Replace missing (None, NaN, empty or 'nan') values with the default, or None without one."""
+    # NaN is the only value not equal to itself
+    if value is None or value != value or value == '' or str(value).lower() == 'nan':
+        return default if default != '' else None
+    return value
+
 def get_tournament_display_name(tournament_name: str) -> str:
     """Convert tournament name to display format."""
-    tournament_map = {
-        'Australian Open': 'Australian Open',
-        'Roland Garros': 'French Open', 
-        'Wimbledon': 'Wimbledon',
-        'US Open': 'US Open'
-    }
-    return tournament_map.get(tournament_name, tournament_name)
+    return TOURNAMENT_DISPLAY_NAMES.get(tournament_name, tournament_name)
+
+def process_year_finals(year: int, data_dir: str) -> List[Dict]:
+    """Process the Grand Slam finals of one year, returning those with a valid score."""
+    year_finals = []
+    csv_file = os.path.join(data_dir, f'atp_matches_{year}.csv')
+    
+    if not os.path.exists(csv_file):
+        print(f"Warning: File {csv_file} not found, skipping...")
+        return year_finals
+    
+    # Reuse this year's finals from an earlier run while its match file is unchanged
+    stat = os.stat(csv_file)
+    cache_file = Path(data_dir) / f"grand_slam_finals_{year}_{CACHE_VERSION}_{stat.st_mtime_ns}_{stat.st_size}.json"
+    if cache_file.exists():
+        # The year's messages (skipped finals included) are cached with its finals
+        cached = orjson.loads(cache_file.read_bytes())
+        print('\n'.join(cached['messages']) + f" (cached in {cache_file})")
+        return cached['finals']
+    
+    # The year's messages are printed together once it is done, so years
+    # processed in parallel don't interleave
+    messages = [f"Processing {year}..."]
+    
+    try:
+        # Filter for Grand Slam finals while scanning the CSV file, so only
+        # those rows (and just the columns a final needs) are materialized
+        matches = ds.dataset(csv_file, format=MATCH_FORMAT, schema=MATCH_SCHEMA)
+        grand_slam_finals = matches.to_table(columns=FINAL_COLUMNS, filter=GRAND_SLAM_FINALS).to_pandas()
+        
+        # Emit the year's finals in tournament order (other tournaments last)
+        grand_slam_finals = grand_slam_finals.sort_values(
+            'tourney_name',
+            key=lambda names: names.map(get_tournament_display_name).map(TOURNAMENT_INDEX).fillna(99),
+            kind='stable'
+        )
+        
+        # Walk the columns as plain lists, one final at a time
+        for (tourney_name, surface, tourney_date,
+             winner_name, winner_ioc, winner_seed, winner_age,
+             loser_name, loser_ioc, loser_seed, loser_age,
+             score, minutes, best_of) in zip(*(grand_slam_finals[column].tolist() for column in FINAL_COLUMNS)):
+            # Parse the score
+            parsed_sets = parse_score(score)
+            
+            if parsed_sets is None:
+                messages.append(f"  Skipping {year} {tourney_name} - invalid score: {score}")
+                continue
+            
+            # Create final data structure
+            final_data = {
+                'id': f"{year}_{tourney_name.replace(' ', '_').lower()}",
+                'year': year,
+                'tournament': get_tournament_display_name(tourney_name),
+                'surface': clean_value(surface, 'Hard'),
+                'date': clean_value(tourney_date),
+                'winner': {
+                    'name': clean_value(winner_name, 'Unknown'),
+                    'country': clean_value(winner_ioc, 'Unknown'),
+                    'seed': clean_value(winner_seed),
+                    'age': clean_value(winner_age)
+                },
+                'loser': {
+                    'name': clean_value(loser_name, 'Unknown'),
+                    'country': clean_value(loser_ioc, 'Unknown'),  
+                    'seed': clean_value(loser_seed),
+                    'age': clean_value(loser_age)
+                },
+                'score_raw': clean_value(score, ''),
+                'sets': parsed_sets,
+                'duration_minutes': clean_value(minutes),
+                'best_of': clean_value(best_of, 5)
+            }
+            
+            year_finals.append(final_data)
+            if VERBOSE:
+                messages.append(f"  Added: {final_data['tournament']} - {final_data['winner']['name']} def. {final_data['loser']['name']}")
+        
+        messages.append(f"  Added {len(year_finals)} finals")
+        cache_file.write_bytes(orjson.dumps({'finals': year_finals, 'messages': messages}))
+
+        # Drop this year's caches from older match files or cache versions
+        for stale_file in Path(data_dir).glob(f"grand_slam_finals_{year}_*.json"):
+            if stale_file != cache_file:
+                stale_file.unlink(missing_ok=True)
+    except Exception as e:
+        messages.append(f"Error processing {year}: {e}")
+    
+    print('\n'.join(messages))
+    return year_finals
 
 def process_grand_slam_finals(data_dir: str = 'tennis_atp-master') -> Dict:
     """
@@ -90,82 +247,14 @@ def process_grand_slam_finals(data_dir: str = 'tennis_atp-master') -> Dict:
         }
     }
     
-    # Process years from 2000 to 2024
-    for year in range(2000, 2025):
-        csv_file = os.path.join(data_dir, f'atp_matches_{year}.csv')
-        
-        if not os.path.exists(csv_file):
-            print(f"Warning: File {csv_file} not found, skipping...")
-            continue
-            
-        print(f"Processing {year}...")
-        
-        try:
-            # Read CSV file
-            df = pd.read_csv(csv_file)
-            
-            # Filter for Grand Slam finals
-            grand_slam_finals = df[
-                (df['tourney_level'] == 'G') & 
-                (df['round'] == 'F')
-            ].copy()
-            
-            for _, match in grand_slam_finals.iterrows():
-                # Parse the score
-                parsed_sets = parse_score(match.get('score', ''))
-                
-                if parsed_sets is None:
-                    print(f"  Skipping {year} {match.get('tourney_name', 'Unknown')} - invalid score: {match.get('score', 'N/A')}")
-                    continue
-                
-                # Helper function to clean NaN values
-                def clean_value(value, default=''):
-                    if pd.isna(value) or value == '' or str(value).lower() == 'nan':
-                        return default if default != '' else None
-                    return value
-
-                # Create final data structure
-                final_data = {
-                    'id': f"{year}_{match.get('tourney_name', '').replace(' ', '_').lower()}",
-                    'year': year,
-                    'tournament': get_tournament_display_name(match.get('tourney_name', '')),
-                    'surface': clean_value(match.get('surface', ''), 'Hard'),
-                    'date': clean_value(match.get('tourney_date', '')),
-                    'winner': {
-                        'name': clean_value(match.get('winner_name', ''), 'Unknown'),
-                        'country': clean_value(match.get('winner_ioc', ''), 'Unknown'),
-                        'seed': clean_value(match.get('winner_seed', '')),
-                        'age': clean_value(match.get('winner_age', ''))
-                    },
-                    'loser': {
-                        'name': clean_value(match.get('loser_name', ''), 'Unknown'),
-                        'country': clean_value(match.get('loser_ioc', ''), 'Unknown'),  
-                        'seed': clean_value(match.get('loser_seed', '')),
-                        'age': clean_value(match.get('loser_age', ''))
-                    },
-                    'score_raw': clean_value(match.get('score', ''), ''),
-                    'sets': parsed_sets,
-                    'duration_minutes': clean_value(match.get('minutes', '')),
-                    'best_of': clean_value(match.get('best_of', 5), 5)
-                }
-                
-                finals_data['finals'].append(final_data)
-                print(f"  Added: {final_data['tournament']} - {final_data['winner']['name']} def. {final_data['loser']['name']}")
-        
-        except Exception as e:
-            print(f"Error processing {year}: {e}")
-            continue
-    
-    # Sort finals by year and tournament order
-    tournament_order = ['Australian Open', 'French Open', 'Wimbledon', 'US Open']
-    
-    def sort_key(final):
-        year = final['year']
-        tournament = final['tournament']
-        tournament_index = tournament_order.index(tournament) if tournament in tournament_order else 99
-        return (year, tournament_index)
+    # Process years from 2000 to 2024; years are independent, so process them
+    # in parallel (results keep year order, so the finals come out sorted by
+    # year and tournament order)
+    years = range(2000, 2025)
+    with ProcessPoolExecutor() as executor:
+        for year_finals in executor.map(process_year_finals, years, repeat(data_dir)):
+            finals_data['finals'].extend(year_finals)
     
-    finals_data['finals'].sort(key=sort_key)
     finals_data['metadata']['total_finals'] = len(finals_data['finals'])
     
     print(f"\nTotal finals processed: {finals_data['metadata']['total_finals']}")
@@ -187,8 +276,7 @@ def main():
     
     # Save to JSON file
     output_file = 'grand_slam_finals.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(finals_data, f, indent=2, ensure_ascii=False)
+    Path(output_file).write_bytes(orjson.dumps(finals_data, option=orjson.OPT_INDENT_2))
     
     print(f"\nData saved to {output_file}")
     
@@ -197,10 +285,7 @@ def main():
     print(f"Total finals: {metadata['total_finals']}")
     
     # Count by tournament
-    tournament_counts = {}
-    for final in finals_data['finals']:
-        tournament = final['tournament']
-        tournament_counts[tournament] = tournament_counts.get(tournament, 0) + 1
+    tournament_counts = Counter(final['tournament'] for final in finals_data['finals'])
     
     print("\nFinals by tournament:")
     for tournament, count in tournament_counts.items():
@@ -4,84 +4,135 @@ Process ATP match data to extract historical head-to-head records for tennis qui
 Focuses on famous rivalries from tennis history.
 """
 
+import numpy as np
 import pandas as pd
-import json
-import os
-from collections import defaultdict, Counter
+import orjson
+import re
 import glob
+import pyarrow as pa
+import pyarrow.csv as pv
+from pathlib import Path
+
+from atp_data import load_match_table, read_players_csv
+
+# Columns (and their types) read from the yearly match files; the records only
+# use each match's players, year and tournament
+MATCH_SCHEMA = pa.schema([
+    ('tourney_name', pa.string()),
+    ('winner_id', pa.int32()),
+    ('loser_id', pa.int32())
+])
+
+def read_match_file(file):
+    """Read one yearly match file as an Arrow table with its year column added."""
+    try:
+        table = pv.read_csv(
+            file,
+            read_options=pv.ReadOptions(use_threads=True),
+            convert_options=pv.ConvertOptions(include_columns=MATCH_SCHEMA.names, column_types=MATCH_SCHEMA)
+        )
+        year = file.split('_')[-1].replace('.csv', '')
+        table = table.append_column('year', pa.array([int(year)] * len(table), pa.int16()))
+        print(f"Loaded {len(table)} matches from {year}")
+        return table
+    except Exception as e:
+        print(f"Error loading {file}: {e}")
+        return None
 
 def load_atp_matches():
     """Load all ATP match data from CSV files."""
     matches_dir = "tennis_atp-master"
-    all_matches = []
     
     # Get all match files
     match_files = glob.glob(f"{matches_dir}/atp_matches_*.csv")
     
-    for file in sorted(match_files):
-        try:
-            df = pd.read_csv(file)
-            year = file.split('_')[-1].replace('.csv', '')
-            df['year'] = int(year)
-            all_matches.append(df)
-            print(f"Loaded {len(df)} matches from {year}")
-        except Exception as e:
-            print(f"Error loading {file}: {e}")
-    
-    if all_matches:
-        combined_df = pd.concat(all_matches, ignore_index=True)
-        print(f"Total matches loaded: {len(combined_df)}")
-        return combined_df
-    else:
-        return pd.DataFrame()
+    return load_match_table('h2h_matches', sorted(match_files), MATCH_SCHEMA, read_match_file)
 
 def load_players_data():
     """Load player names and info."""
     try:
-        players_df = pd.read_csv("tennis_atp-master/atp_players.csv")
+        players_df = read_players_csv(['player_id', 'name_first', 'name_last'], dtype={'player_id': 'int32'})
         # Create a mapping of player_id to name
-        player_names = {}
-        for _, row in players_df.iterrows():
-            player_names[row['player_id']] = f"{row['name_first']} {row['name_last']}"
-        return player_names
+        return {
+            player_id: f"{first_name} {last_name}"
+            for player_id, first_name, last_name in zip(
+                players_df['player_id'].tolist(),
+                players_df['name_first'].tolist(),
+                players_df['name_last'].tolist()
+            )
+        }
     except Exception as e:
         print(f"Error loading players data: {e}")
         return {}
 
 def calculate_h2h_records(matches_df, player_names):
-    """Calculate head-to-head records between all players."""
-    h2h_records = defaultdict(lambda: defaultdict(lambda: {'wins': 0, 'losses': 0, 'matches': []}))
+    """Calculate head-to-head records between all players.
     
-    for _, match in matches_df.iterrows():
-        winner_id = match['winner_id']
-        loser_id = match['loser_id']
-        
-        # Skip if either player ID is missing
-        if pd.isna(winner_id) or pd.isna(loser_id):
-            continue
-            
-        winner_id = int(winner_id)
-        loser_id = int(loser_id)
-        
-        # Get player names
-        winner_name = player_names.get(winner_id, f"Player_{winner_id}")
-        loser_name = player_names.get(loser_id, f"Player_{loser_id}")
-        
-        # Record the match
-        match_info = {
-            'year': match.get('year', 'Unknown'),
-            'tournament': match.get('tourney_name', 'Unknown'),
-            'surface': match.get('surface', 'Unknown'),
-            'score': match.get('score', 'Unknown')
-        }
-        
-        # Update records for both players
-        h2h_records[winner_name][loser_name]['wins'] += 1
-        h2h_records[loser_name][winner_name]['losses'] += 1
-        h2h_records[winner_name][loser_name]['matches'].append(match_info)
-        h2h_records[loser_name][winner_name]['matches'].append(match_info)
+    Returns a DataFrame indexed by (player1, player2) with player1's wins and
+    losses against player2, their number of matches, the first and last year
+    they met and the number of tournaments they met at. Every pair appears
+    once, with player1 < player2.
+    """
+    # Skip matches where either player ID is missing
+    matches = matches_df.dropna(subset=['winner_id', 'loser_id'])
+    
+    # Get player names
+    winner_names = [player_names.get(player_id, f"Player_{player_id}") for player_id in matches['winner_id'].astype('int64').tolist()]
+    loser_names = [player_names.get(player_id, f"Player_{player_id}") for player_id in matches['loser_id'].astype('int64').tolist()]
+    match_order = np.arange(len(matches))
     
-    return h2h_records
+    # Winners and losers share one categorical type with sorted categories, so
+    # names are compared and grouped as integer codes in name order
+    name_type = pd.CategoricalDtype(sorted(set(winner_names).union(loser_names)))
+    winner_codes = pd.Categorical(winner_names, dtype=name_type).codes
+    loser_codes = pd.Categorical(loser_names, dtype=name_type).codes
+    names = name_type.categories.to_numpy()
+    
+    # Store each match once under its (alphabetically first, second) player pair
+    winner_is_first = winner_codes < loser_codes
+    pair_matches = pa.table({
+        'first': np.where(winner_is_first, winner_codes, loser_codes),
+        'second': np.where(winner_is_first, loser_codes, winner_codes),
+        'first_won': winner_is_first,
+        'year': matches['year'].to_numpy(),
+        'tournament': matches['tourney_name'].to_numpy(),
+        'match': match_order
+    })
+    pairs = pair_matches.group_by(['first', 'second']).aggregate([
+        ('first_won', 'sum'),
+        ('first_won', 'count'),
+        ('year', 'min'),
+        ('year', 'max'),
+        ('tournament', 'count_distinct'),
+        ('match', 'min')
+    ]).to_pandas()
+    
+    # Order players by their first match (winner's side before loser's)
+    player_first_seen = np.full(len(names), 2 * len(matches))
+    np.minimum.at(player_first_seen, winner_codes, match_order * 2)
+    np.minimum.at(player_first_seen, loser_codes, match_order * 2 + 1)
+    
+    first_wins = pairs['first_won_sum'].astype('int64')
+    h2h_records = pd.DataFrame({
+        'player1': pairs['first'],
+        'player2': pairs['second'],
+        'wins': first_wins,
+        'losses': pairs['first_won_count'] - first_wins,
+        'total_matches': pairs['first_won_count'],
+        'first_year': pairs['year_min'],
+        'last_year': pairs['year_max'],
+        'tournaments': pairs['tournament_count_distinct'],
+        'first_match': pairs['match_min']
+    })
+    
+    # Sort by first player, then opponents by their first meeting, and decode the names
+    h2h_records['player_first_seen'] = player_first_seen[h2h_records['player1']]
+    h2h_records = h2h_records.sort_values(['player_first_seen', 'first_match'])
+    h2h_records['player1'] = names[h2h_records['player1']]
+    h2h_records['player2'] = names[h2h_records['player2']]
+    h2h_records = h2h_records.set_index(['player1', 'player2'])
+    
+    return h2h_records[['wins', 'losses', 'total_matches', 'first_year', 'last_year', 'tournaments']]
 
 def get_famous_rivalries():
     """Define famous tennis rivalries to focus on, prioritizing 80s onwards."""
@@ -134,61 +185,32 @@ def get_famous_rivalries():
         ("Bjorn Borg", "Jimmy Connors"),
     ]
 
-def format_rivalry_data(h2h_records, player1, player2):
-    """Format rivalry data for the game."""
-    if player1 not in h2h_records or player2 not in h2h_records[player1]:
-        return None
-    
-    p1_record = h2h_records[player1][player2]
-    p1_wins = p1_record['wins']
-    p1_losses = p1_record['losses']
+def format_rivalry_data(records):
+    """Format rivalry data for the game, one rivalry per player1/player2 H2H record.
     
-    total_matches = p1_wins + p1_losses
+    Rivalries with too few matches (fewer than 3) are left out.
+    """
+    records = records[records['total_matches'] >= 3]
+    wins = records['wins'].astype('int64')
+    losses = records['losses'].astype('int64')
+    total_matches = records['total_matches'].astype('int64')
     
-    if total_matches < 3:  # Skip rivalries with too few matches
-        return None
-    
-    # Determine who leads
-    if p1_wins > p1_losses:
-        leader = player1
-        leader_wins = p1_wins
-        trail_wins = p1_losses
-    elif p1_losses > p1_wins:
-        leader = player2
-        leader_wins = p1_losses
-        trail_wins = p1_wins
-    else:
-        leader = "Tied"
-        leader_wins = p1_wins
-        trail_wins = p1_losses
+    # Determine who leads (the leader's wins come first, also when tied)
+    leader_wins = np.maximum(wins, losses)
+    trail_wins = np.minimum(wins, losses)
     
-    # Get surface breakdown
-    surface_breakdown = defaultdict(lambda: {'wins': 0, 'losses': 0})
-    tournaments = set()
-    years_active = set()
-    
-    for match in p1_record['matches']:
-        surface = match.get('surface', 'Unknown')
-        year = match.get('year', 'Unknown')
-        tournament = match.get('tournament', 'Unknown')
-        
-        if year != 'Unknown':
-            years_active.add(year)
-        if tournament != 'Unknown':
-            tournaments.add(tournament)
-    
-    return {
-        'player1': player1,
-        'player2': player2,
+    return pd.DataFrame({
+        'player1': records['player1'],
+        'player2': records['player2'],
         'total_matches': total_matches,
-        'leader': leader,
+        'leader': np.where(wins > losses, records['player1'], np.where(losses > wins, records['player2'], 'Tied')),
         'leader_wins': leader_wins,
         'trail_wins': trail_wins,
-        'h2h_display': f"{leader_wins}-{trail_wins}",
-        'years_span': f"{min(years_active)}-{max(years_active)}" if years_active else "Unknown",
-        'total_tournaments': len(tournaments),
-        'difficulty': 'medium' if total_matches > 10 else 'easy'
-    }
+        'h2h_display': leader_wins.astype(str) + '-' + trail_wins.astype(str),
+        'years_span': records['first_year'].astype('int64').astype(str) + '-' + records['last_year'].astype('int64').astype(str),
+        'total_tournaments': records['tournaments'].astype('int64'),
+        'difficulty': np.where(total_matches > 10, 'medium', 'easy')
+    })
 
 def main():
     """Main function to process data and create H2H quiz data."""
@@ -210,11 +232,27 @@ def main():
     
     # Process famous rivalries
     famous_rivalries = get_famous_rivalries()
+    # Famous pairs in the alphabetical order H2H records are keyed by
+    famous_pairs = frozenset(tuple(sorted(pair)) for pair in famous_rivalries)
     rivalry_data = []
     
     print("\nProcessing famous rivalries...")
-    for player1, player2 in famous_rivalries:
-        rivalry = format_rivalry_data(h2h_records, player1, player2)
+    famous_df = pd.DataFrame(famous_rivalries, columns=['player1', 'player2'])
+    # Records are stored under the alphabetically ordered pair
+    is_reversed = famous_df['player1'] > famous_df['player2']
+    famous_df['first'] = famous_df['player1'].where(~is_reversed, famous_df['player2'])
+    famous_df['second'] = famous_df['player2'].where(~is_reversed, famous_df['player1'])
+    famous_records = famous_df.merge(h2h_records, how='left', left_on=['first', 'second'], right_index=True)
+    famous_records['wins'], famous_records['losses'] = (
+        famous_records['wins'].where(~is_reversed, famous_records['losses']),
+        famous_records['losses'].where(~is_reversed, famous_records['wins'])
+    )
+    # Pairs that never met have no matches
+    famous_records = famous_records.fillna(0)
+    famous_formatted = format_rivalry_data(famous_records)
+    famous_rivalry_data = dict(zip(famous_formatted.index, famous_formatted.to_dict('records')))
+    for index, (player1, player2) in enumerate(famous_rivalries):
+        rivalry = famous_rivalry_data.get(index)
         if rivalry:
             rivalry_data.append(rivalry)
             print(f"✓ {player1} vs {player2}: {rivalry['h2h_display']} ({rivalry['total_matches']} matches)")
@@ -223,8 +261,6 @@ def main():
     
     # Add some additional interesting rivalries from the data (prioritize 80s onwards)
     print("\nFinding additional rivalries with 15+ matches (prioritizing 80s onwards)...")
-    additional_rivalries = []
-    processed_pairs = set()
     
     # List of players from 80s onwards to prioritize
     modern_era_keywords = [
@@ -238,32 +274,30 @@ def main():
         'Janko Tipsarevic', 'Mardy Fish', 'John Isner', 'Kei Nishikori', 'Milos Raonic'
     ]
     
-    for p1, opponents in h2h_records.items():
-        for p2, record in opponents.items():
-            if p1 < p2:  # Avoid duplicates
-                pair_key = (p1, p2)
-                if pair_key not in processed_pairs:
-                    processed_pairs.add(pair_key)
-                    total = record['wins'] + record['losses']
-                    if total >= 12 and (p1, p2) not in famous_rivalries and (p2, p1) not in famous_rivalries:
-                        # Prioritize rivalries involving modern era players
-                        is_modern_rivalry = any(keyword in p1 or keyword in p2 for keyword in modern_era_keywords)
-                        rivalry = format_rivalry_data(h2h_records, p1, p2)
-                        if rivalry:
-                            # Add priority score
-                            rivalry['priority'] = 2 if is_modern_rivalry else 1
-                            additional_rivalries.append(rivalry)
+    # Pairs with enough matches, excluding famous rivalries in either order
+    is_candidate = (h2h_records['total_matches'] >= 12) & ~h2h_records.index.isin(famous_pairs)
+    candidates = h2h_records[is_candidate].reset_index()
+    
+    # Prioritize rivalries involving modern era players (named anywhere in either name)
+    modern_era_pattern = '|'.join(map(re.escape, modern_era_keywords))
+    is_modern_rivalry = (
+        candidates['player1'].str.contains(modern_era_pattern, regex=True) |
+        candidates['player2'].str.contains(modern_era_pattern, regex=True)
+    )
+    
+    # Format the candidates together and add their priority score
+    additional_rivalries = format_rivalry_data(candidates)
+    additional_rivalries['priority'] = np.where(is_modern_rivalry, 2, 1)
     
     # Sort by priority first (modern era), then by total matches
-    additional_rivalries.sort(key=lambda x: (x['priority'], x['total_matches']), reverse=True)
-    rivalry_data.extend(additional_rivalries[:25])
+    additional_rivalries = additional_rivalries.sort_values(['priority', 'total_matches'], ascending=False, kind='stable')
+    rivalry_data.extend(additional_rivalries.head(25).to_dict('records'))
     
     print(f"\nTotal rivalries processed: {len(rivalry_data)}")
     
     # Save to JSON file
     output_file = "h2h_rivalries.json"
-    with open(output_file, 'w') as f:
-        json.dump(rivalry_data, f, indent=2)
+    Path(output_file).write_bytes(orjson.dumps(rivalry_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     
     print(f"\nH2H data saved to {output_file}")
     print(f"Ready for Head-to-Head Masters game!")
@@ -4,10 +4,38 @@ Process ATP match data to calculate tournament titles for tennis players from 19
 Creates a JSON file with player data including ATP titles for the tennis tier list game.
 """
 
-import pandas as pd
 import json
 import os
-from collections import defaultdict
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.dataset as ds
+
+# Columns (and their types) read from the yearly match files
+MATCH_SCHEMA = pa.schema([
+    ('tourney_level', pa.string()),
+    ('winner_id', pa.int32()),
+    ('winner_name', pa.string()),
+    ('winner_hand', pa.string()),
+    ('winner_ht', pa.float64()),
+    ('winner_ioc', pa.string()),
+    ('round', pa.string())
+])
+
+# Empty fields are missing values, as pd.read_csv would treat them
+MATCH_FORMAT = ds.CsvFileFormat(convert_options=pv.ConvertOptions(strings_can_be_null=True))
+
+# Winner columns kept from the main tour finals
+WINNER_COLUMNS = ['winner_id', 'winner_name', 'winner_hand', 'winner_ioc', 'winner_ht']
+
+# Final matches only (tournament winners) of main tour events (excluding Challengers,
+# ITFs, etc.): Grand Slams (G), Masters (M), ATP Tour (A), and Finals (F)
+MAIN_TOUR_FINALS = (pc.field('round') == 'F') & pc.field('tourney_level').isin(['G', 'M', 'A', 'F'])
+
+def scan_main_tour_finals(match_files):
+    """Read the winner columns of the main tour finals in these match files as an Arrow table."""
+    matches = ds.dataset(match_files, format=MATCH_FORMAT, schema=MATCH_SCHEMA)
+    return matches.to_table(columns=WINNER_COLUMNS, filter=MAIN_TOUR_FINALS)
 
 def get_atp_titles(data_dir="tennis_atp-master"):
     """
@@ -17,10 +45,6 @@ def get_atp_titles(data_dir="tennis_atp-master"):
         dict: Player data with titles count, sorted by titles descending
     """
     
-    # Dictionary to store title counts per player
-    player_titles = defaultdict(int)
-    player_info = {}  # Store player details
-    
     # Get list of all available ATP match files
     match_files = []
     for year in range(1968, 2025):  # From first Open Era year to 2024
@@ -31,58 +55,49 @@ def get_atp_titles(data_dir="tennis_atp-master"):
     
     print(f"Processing {len(match_files)} files...")
     
-    # Process each year's matches
-    for filepath in match_files:
-        year = filepath.split('_')[-1].split('.')[0]
-        print(f"Processing {year}...")
-        
-        try:
-            # Read the CSV file
-            df = pd.read_csv(filepath)
-            
-            # Filter for final matches only (tournament winners)
-            finals = df[df['round'] == 'F'].copy()
-            
-            # Filter for main tour events (excluding Challengers, ITFs, etc.)
-            # Keep Grand Slams (G), Masters (M), ATP Tour (A), and Finals (F)
-            main_tour = finals[finals['tourney_level'].isin(['G', 'M', 'A', 'F'])]
-            
-            # Count titles for each player
-            for _, match in main_tour.iterrows():
-                winner_id = match['winner_id']
-                winner_name = match['winner_name']
-                
-                # Skip if missing essential data
-                if pd.isna(winner_id) or pd.isna(winner_name):
-                    continue
-                    
-                player_titles[winner_id] += 1
-                
-                # Store player info (will overwrite with most recent info)
-                player_info[winner_id] = {
-                    'name': winner_name,
-                    'hand': match.get('winner_hand', 'U'),
-                    'country': match.get('winner_ioc', ''),
-                    'height': match.get('winner_ht', ''),
-                }
-                
-        except Exception as e:
-            print(f"Error processing {filepath}: {e}")
-            continue
+    # Scan all years in one pass, keeping only the main tour finals while decoding
+    try:
+        finals = scan_main_tour_finals(match_files)
+    except Exception as e:
+        # Fall back to one file at a time, so a bad file is reported and skipped
+        print(f"Error processing match files together: {e}")
+        finals_tables = []
+        for filepath in match_files:
+            try:
+                finals_tables.append(scan_main_tour_finals(filepath))
+            except Exception as e:
+                print(f"Error processing {filepath}: {e}")
+        finals = pa.concat_tables(finals_tables) if finals_tables else MATCH_SCHEMA.empty_table().select(WINNER_COLUMNS)
+    finals = finals.to_pandas()
+    
+    # Skip finals missing essential data
+    finals = finals.dropna(subset=['winner_id', 'winner_name'])
+    
+    # Count titles for each player, in order of their first title
+    player_titles = finals.groupby('winner_id', sort=False).size()
+    
+    # Player details come from each player's most recent title
+    player_info = finals.drop_duplicates('winner_id', keep='last').set_index('winner_id').reindex(player_titles.index)
     
     # Create final player data structure
-    players_data = []
-    for player_id, titles in player_titles.items():
-        if player_id in player_info and titles > 0:  # Only include players with titles
-            player_data = {
-                'id': int(player_id),
-                'name': player_info[player_id]['name'],
-                'titles': titles,
-                'hand': player_info[player_id]['hand'],
-                'country': player_info[player_id]['country'],
-                'height': player_info[player_id]['height']
-            }
-            players_data.append(player_data)
+    players_data = [
+        {
+            'id': int(player_id),
+            'name': name,
+            'titles': titles,
+            'hand': hand,
+            'country': country,
+            'height': height
+        }
+        for player_id, titles, name, hand, country, height in zip(
+            player_titles.index.tolist(),
+            player_titles.tolist(),
+            player_info['winner_name'].tolist(),
+            player_info['winner_hand'].tolist(),
+            player_info['winner_ioc'].tolist(),
+            player_info['winner_ht'].tolist()
+        )
+    ]
     
     # Sort by titles (descending)
     players_data.sort(key=lambda x: x['titles'], reverse=True)
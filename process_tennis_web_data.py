@@ -5,52 +5,68 @@ This script builds a comprehensive player connection network.
 """
 
 import pandas as pd
-import json
+import orjson
 import glob
-import os
 from collections import defaultdict, Counter
 from datetime import datetime
 import re
 import numpy as np
-import math
+import pyarrow as pa
+import pyarrow.csv as pv
+from pathlib import Path
 
-class CustomJSONEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            if math.isnan(obj):
-                return None
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        return super(CustomJSONEncoder, self).default(obj)
+from atp_data import load_match_table
+
+# Columns (and their types) read from the yearly match files; the repetitive
+# string columns are dictionary-encoded and arrive in pandas as categoricals
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+MATCH_SCHEMA = pa.schema([
+    ('tourney_name', CATEGORY),
+    ('surface', CATEGORY),
+    ('winner_id', pa.int64()),
+    ('loser_id', pa.int64()),
+    ('score', pa.string()),
+    ('round', CATEGORY)
+])
+
+# Connection types derived from player attributes, whose lists are shared by a whole group
+ATTRIBUTE_CONNECTION_TYPES = ['same_country', 'same_hand', 'similar_height', 'same_birth_year']
+
+# Connected players are held as compact int32 arrays; this one stands in for "none"
+NO_PLAYERS = np.empty(0, dtype=np.int32)
+
+def read_match_file(file):
+    """Read one yearly match file as an Arrow table with its year column added."""
+    year = int(re.search(r'(\d{4})', file).group(1))
+    try:
+        # Files are already read in parallel by the process pool, so each one
+        # is parsed on a single thread; empty fields become nulls
+        table = pv.read_csv(
+            file,
+            read_options=pv.ReadOptions(use_threads=False, block_size=16 << 20),
+            convert_options=pv.ConvertOptions(
+                include_columns=MATCH_SCHEMA.names,
+                column_types=MATCH_SCHEMA,
+                strings_can_be_null=True
+            )
+        )
+        # Add year column for easier processing
+        table = table.append_column('year', pa.array([year] * len(table), pa.int16()))
+        print(f"  Loaded {len(table)} matches from {year}")
+        return table
+    except Exception as e:
+        print(f"  Error loading {file}: {e}")
+        return None
 
 def load_all_match_data():
     """Load all ATP match data from CSV files."""
     print("Loading match data...")
     
     match_files = glob.glob('tennis_atp-master/atp_matches_*.csv')
-    all_matches = []
-    
-    for file in sorted(match_files):
-        year = int(re.search(r'(\d{4})', file).group(1))
-        if year >= 1990:  # Focus on modern era for better data quality
-            try:
-                df = pd.read_csv(file, low_memory=False)
-                # Add year column for easier processing
-                df['year'] = year
-                all_matches.append(df)
-                print(f"  Loaded {len(df)} matches from {year}")
-            except Exception as e:
-                print(f"  Error loading {file}: {e}")
-    
-    if all_matches:
-        combined_df = pd.concat(all_matches, ignore_index=True)
-        print(f"Total matches loaded: {len(combined_df)}")
-        return combined_df
-    else:
-        return pd.DataFrame()
+    # Focus on modern era for better data quality
+    match_files = [file for file in sorted(match_files) if int(re.search(r'(\d{4})', file).group(1)) >= 1990]
+    
+    return load_match_table('web_matches', match_files, MATCH_SCHEMA, read_match_file)
 
 def load_player_data():
     """Load player data from JSON and CSV files."""
@@ -59,50 +75,63 @@ def load_player_data():
     # Load from tennis_players_data.json
     players_data = {}
     try:
-        with open('tennis_players_data.json', 'r') as f:
-            players_list = json.load(f)
-            for player in players_list:
-                players_data[player['id']] = {
-                    'name': player['name'],
-                    'country': player['country'],
-                    'hand': player['hand'],
-                    'height': player.get('height'),
-                    'titles': player.get('titles', 0)
-                }
+        players_list = orjson.loads(Path('tennis_players_data.json').read_bytes())
+        for player in players_list:
+            players_data[player['id']] = {
+                'name': player['name'],
+                'country': player['country'],
+                'hand': player['hand'],
+                'height': player.get('height'),
+                'titles': player.get('titles', 0)
+            }
         print(f"  Loaded {len(players_data)} players from JSON")
     except Exception as e:
         print(f"  Error loading players JSON: {e}")
     
     # Load additional data from ATP players CSV
     try:
-        atp_players = pd.read_csv('tennis_atp-master/atp_players.csv')
-        for _, row in atp_players.iterrows():
-            player_id = row['player_id']
-            if player_id not in players_data:
-                players_data[player_id] = {}
+        atp_players = pd.read_csv(
+            'tennis_atp-master/atp_players.csv',
+            usecols=['player_id', 'name_first', 'name_last', 'hand', 'dob', 'ioc', 'height']
+        )
+        
+        # Birth dates from the 8-digit (YYYYMMDD) DOBs, for the whole column at once
+        dobs = atp_players['dob'].dropna().astype(np.int64).astype(str)
+        dobs = dobs[dobs.str.len() == 8]
+        birth_dates = (dobs.str[:4] + '-' + dobs.str[4:6] + '-' + dobs.str[6:8]).reindex(atp_players.index)
+        birth_years = dobs.str[:4].astype(np.int64).astype(object).reindex(atp_players.index)
+        
+        # Missing optional values become None so the loop can test them cheaply
+        birth_dates = birth_dates.astype(object).where(birth_dates.notna(), None)
+        birth_years = birth_years.astype(object).where(birth_years.notna(), None)
+        heights = atp_players['height'].astype(object).where(atp_players['height'].notna(), None)
+        
+        for player_id, first_name, last_name, country, hand, height, birth_date, birth_year in zip(
+            atp_players['player_id'].tolist(),
+            atp_players['name_first'].tolist(),
+            atp_players['name_last'].tolist(),
+            atp_players['ioc'].tolist(),
+            atp_players['hand'].tolist(),
+            heights.tolist(),
+            birth_dates.tolist(),
+            birth_years.tolist()
+        ):
+            player = players_data.setdefault(player_id, {})
             
             # Add DOB if available
-            if pd.notna(row['dob']):
-                try:
-                    dob_str = str(int(row['dob']))
-                    if len(dob_str) == 8:
-                        year = int(dob_str[:4])
-                        month = int(dob_str[4:6])
-                        day = int(dob_str[6:8])
-                        players_data[player_id]['birth_date'] = f"{year}-{month:02d}-{day:02d}"
-                        players_data[player_id]['birth_year'] = year
-                except:
-                    pass
+            if birth_date is not None:
+                player['birth_date'] = birth_date
+                player['birth_year'] = birth_year
             
             # Update other fields if not already present
-            if 'name' not in players_data[player_id]:
-                players_data[player_id]['name'] = f"{row['name_first']} {row['name_last']}"
-            if 'country' not in players_data[player_id]:
-                players_data[player_id]['country'] = row['ioc']
-            if 'hand' not in players_data[player_id]:
-                players_data[player_id]['hand'] = row['hand']
-            if 'height' not in players_data[player_id] and pd.notna(row['height']):
-                players_data[player_id]['height'] = row['height']
+            if 'name' not in player:
+                player['name'] = f"{first_name} {last_name}"
+            if 'country' not in player:
+                player['country'] = country
+            if 'hand' not in player:
+                player['hand'] = hand
+            if 'height' not in player and height is not None:
+                player['height'] = height
         
         print(f"  Enhanced data for {len(players_data)} players")
     except Exception as e:
@@ -115,55 +144,104 @@ def load_grand_slam_data():
     print("Loading Grand Slam finals data...")
     
     try:
-        with open('grand_slam_finals.json', 'r') as f:
-            gs_data = json.load(f)
+        gs_data = orjson.loads(Path('grand_slam_finals.json').read_bytes())
         print(f"  Loaded {len(gs_data['finals'])} Grand Slam finals")
         return gs_data['finals']
     except Exception as e:
         print(f"  Error loading Grand Slam data: {e}")
         return []
 
-def extract_head_to_head_connections(matches_df, players_data):
-    """Extract direct opponent connections from match data."""
+def unique_pairs(player_ids, neighbor_ids):
+    """Return the distinct (player, neighbor) pairs, each packed into one int64, sorted by player."""
+    return np.unique((np.asarray(player_ids, dtype=np.int64) << 32) | np.asarray(neighbor_ids, dtype=np.int64))
+
+def group_neighbors(player_ids, neighbor_ids):
+    """Map each player to a sorted int32 array of its distinct neighbors."""
+    # The unique pairs are sorted by player, so each player's neighbors are one contiguous run
+    pairs = unique_pairs(player_ids, neighbor_ids)
+    players, starts = np.unique(pairs >> 32, return_index=True)
+    neighbors = (pairs & 0xFFFFFFFF).astype(np.int32)
+    return dict(zip(players.tolist(), np.split(neighbors, starts[1:])))
+
+def match_opponents(matches_df):
+    """Return (player, opponent) ID arrays with both directions of every match."""
+    # Matches without both players are skipped
+    matches = matches_df.dropna(subset=['winner_id', 'loser_id'])
+    winner_ids = matches['winner_id'].to_numpy(np.int64)
+    loser_ids = matches['loser_id'].to_numpy(np.int64)
+    return np.concatenate([winner_ids, loser_ids]), np.concatenate([loser_ids, winner_ids])
+
+def count_opponents(matches_df):
+    """Count the distinct direct opponents of every player."""
+    players, counts = np.unique(unique_pairs(*match_opponents(matches_df)) >> 32, return_counts=True)
+    return dict(zip(players.tolist(), counts.tolist()))
+
+def extract_head_to_head_connections(matches_df, player_ids):
+    """Extract direct opponent connections of the given players from match data."""
     print("Building head-to-head connections...")
     
-    h2h_connections = defaultdict(set)
-    match_details = defaultdict(list)
-    
-    for _, match in matches_df.iterrows():
-        winner_id = match['winner_id']
-        loser_id = match['loser_id']
-        
-        if pd.notna(winner_id) and pd.notna(loser_id):
-            winner_id = int(winner_id)
-            loser_id = int(loser_id)
-            
-            # Add bidirectional connection
-            h2h_connections[winner_id].add(loser_id)
-            h2h_connections[loser_id].add(winner_id)
-            
-            # Store match details
-            match_info = {
-                'opponent_id': loser_id,
-                'tournament': match.get('tourney_name', '') or '',
-                'year': match.get('year', '') or '',
-                'surface': match.get('surface', '') if pd.notna(match.get('surface', '')) else '',
-                'round': match.get('round', '') or '',
-                'score': match.get('score', '') or '',
-                'result': 'W'
-            }
-            match_details[winner_id].append(match_info)
-            
-            match_info_loser = match_info.copy()
-            match_info_loser['opponent_id'] = winner_id
-            match_info_loser['result'] = 'L'
-            match_details[loser_id].append(match_info_loser)
+    # Bidirectional connections: each match links winner to loser and loser to winner
+    players, opponents = match_opponents(matches_df)
+    wanted = np.isin(players, np.fromiter(player_ids, dtype=np.int64))
+    h2h_connections = group_neighbors(players[wanted], opponents[wanted])
     
     print(f"  Found direct connections for {len(h2h_connections)} players")
-    return dict(h2h_connections), dict(match_details)
+    return h2h_connections
+
+def extract_match_details(matches_df, player_ids, max_matches=50):
+    """Extract the first matches (up to max_matches) of each of the given players."""
+    print("Collecting match details...")
+    
+    # Pull the needed columns out once; matches without both players are skipped
+    matches = matches_df[['winner_id', 'loser_id', 'tourney_name', 'year', 'surface', 'round', 'score']]
+    matches = matches.dropna(subset=['winner_id', 'loser_id'])
+    winner_ids = matches['winner_id'].to_numpy(np.int64)
+    loser_ids = matches['loser_id'].to_numpy(np.int64)
+    
+    # One row per player per match (in match order), keeping only the given
+    # players' first matches, so details are only built for rows that are written
+    appearances = pd.DataFrame({
+        'match': np.repeat(np.arange(len(matches)), 2),
+        'player_id': np.column_stack([winner_ids, loser_ids]).ravel(),
+        'opponent_id': np.column_stack([loser_ids, winner_ids]).ravel(),
+        'result': np.tile(['W', 'L'], len(matches))
+    })
+    appearances = appearances[appearances['player_id'].isin(player_ids)]
+    appearances = appearances.groupby('player_id', sort=False).head(max_matches)
+    
+    details = matches.iloc[appearances['match'].to_numpy()]
+    detail_columns = ['tourney_name', 'surface', 'round', 'score']
+    details[detail_columns] = details[detail_columns].astype(object).fillna('')
+    
+    match_details = {}
+    for player_id, opponent_id, result, tournament, year, surface, round_, score in zip(
+        appearances['player_id'].tolist(),
+        appearances['opponent_id'].tolist(),
+        appearances['result'].tolist(),
+        details['tourney_name'].tolist(),
+        details['year'].tolist(),
+        details['surface'].tolist(),
+        details['round'].tolist(),
+        details['score'].tolist()
+    ):
+        match_details.setdefault(player_id, []).append({
+            'opponent_id': opponent_id,
+            'tournament': tournament,
+            'year': year,
+            'surface': surface,
+            'round': round_,
+            'score': score,
+            'result': result
+        })
+    
+    print(f"  Collected match details for {len(match_details)} players")
+    return match_details
 
 def extract_attribute_connections(players_data):
-    """Extract connections based on player attributes (optimized for memory)."""
+    """Extract connections based on player attributes (optimized for memory).
+    
+    Returns a player -> group map for each attribute connection type.
+    """
     print("Building attribute-based connections...")
     
     # Only work with players that have sufficient data
@@ -192,61 +270,69 @@ def extract_attribute_connections(players_data):
         if data.get('birth_year'):
             year_groups[data['birth_year']].append(player_id)
     
-    attribute_connections = defaultdict(lambda: defaultdict(list))
+    # One flat player -> group map per connection type
+    same_country = {}
+    same_hand = {}
+    similar_height = {}
+    same_birth_year = {}
     
-    # Build connections within groups
+    # Build connections within groups: every member shares its group's array
+    # (which includes the member itself) instead of holding its own copy
     for country, players in country_groups.items():
         if len(players) > 1:
+            group = np.array(players, dtype=np.int32)
             for player in players:
-                others = [p for p in players if p != player]
-                attribute_connections[player]['same_country'] = others
+                same_country[player] = group
     
     for hand, players in hand_groups.items():
         if len(players) > 1:
+            group = np.array(players, dtype=np.int32)
             for player in players:
-                others = [p for p in players if p != player]
-                attribute_connections[player]['same_hand'] = others
+                same_hand[player] = group
     
     for height_range, players in height_groups.items():
         if len(players) > 1:
+            group = np.array(players, dtype=np.int32)
             for player in players:
-                others = [p for p in players if p != player]
-                attribute_connections[player]['similar_height'] = others
+                similar_height[player] = group
     
     for year, players in year_groups.items():
         if len(players) > 1:
+            group = np.array(players, dtype=np.int32)
             for player in players:
-                others = [p for p in players if p != player]
-                attribute_connections[player]['same_birth_year'] = others
+                same_birth_year[player] = group
     
-    print(f"  Built attribute connections for {len(attribute_connections)} players")
-    return dict(attribute_connections)
+    attribute_connections = {
+        'same_country': same_country,
+        'same_hand': same_hand,
+        'similar_height': similar_height,
+        'same_birth_year': same_birth_year
+    }
+    connected_players = set().union(*attribute_connections.values())
+    print(f"  Built attribute connections for {len(connected_players)} players")
+    return attribute_connections
 
-def extract_tournament_connections(matches_df, gs_finals):
-    """Extract connections based on tournament participation."""
+def extract_tournament_connections(matches_df, gs_finals, player_ids):
+    """Extract connections of the given players based on tournament participation."""
     print("Building tournament connections...")
     
-    tournament_connections = defaultdict(lambda: defaultdict(set))
-    
-    # From regular matches - same tournament participation
-    tournament_players = defaultdict(set)
-    for _, match in matches_df.iterrows():
-        tournament = match.get('tourney_name', '')
-        year = match.get('year', '')
-        if tournament and year:
-            tournament_key = f"{tournament}_{year}"
-            if pd.notna(match['winner_id']):
-                tournament_players[tournament_key].add(int(match['winner_id']))
-            if pd.notna(match['loser_id']):
-                tournament_players[tournament_key].add(int(match['loser_id']))
-    
-    # Create connections for players who played same tournaments
-    for tournament_key, players in tournament_players.items():
-        players_list = list(players)
-        for i, player1 in enumerate(players_list):
-            for player2 in players_list[i+1:]:
-                tournament_connections[player1]['same_tournament'].add(player2)
-                tournament_connections[player2]['same_tournament'].add(player1)
+    # From regular matches - same tournament participation: one row per player
+    # per tournament (name and year)
+    participants = pd.concat([
+        matches_df[['tourney_name', 'year', 'winner_id']].rename(columns={'winner_id': 'player_id'}),
+        matches_df[['tourney_name', 'year', 'loser_id']].rename(columns={'loser_id': 'player_id'})
+    ]).dropna(subset=['tourney_name', 'player_id']).drop_duplicates()
+    participants['player_id'] = participants['player_id'].astype(np.int64)
+    
+    # Pair up players who played the same tournaments with a self-join, then
+    # collect each player's distinct co-participants
+    wanted = participants[participants['player_id'].isin(player_ids)]
+    co_players = wanted.merge(participants, on=['tourney_name', 'year'], suffixes=('', '_other'))
+    co_players = co_players[co_players['player_id'] != co_players['player_id_other']]
+    tournament_connections = {
+        player_id: {'same_tournament': others}
+        for player_id, others in group_neighbors(co_players['player_id'], co_players['player_id_other']).items()
+    }
     
     # Grand Slam finals connections
     gs_finalists = defaultdict(set)
@@ -268,23 +354,17 @@ def extract_tournament_connections(matches_df, gs_finals):
                 # Store as names for now, will convert to IDs in final processing
                 pass
     
-    # Convert sets to lists
-    for player_id in tournament_connections:
-        for connection_type in tournament_connections[player_id]:
-            tournament_connections[player_id][connection_type] = list(tournament_connections[player_id][connection_type])
-    
     print(f"  Built tournament connections for {len(tournament_connections)} players")
-    return dict(tournament_connections)
+    return tournament_connections
 
-def get_popular_players(players_data, h2h_connections, min_connections=10):
+def get_popular_players(players_data, opponent_counts, min_connections=10):
     """Get list of players with sufficient connections for the game."""
     popular_players = []
     
     for player_id, data in players_data.items():
         if (isinstance(data, dict) and 
             'name' in data and 
-            player_id in h2h_connections and
-            len(h2h_connections[player_id]) >= min_connections):
+            opponent_counts.get(player_id, 0) >= min_connections):
             
             player_info = {
                 'id': player_id,
@@ -294,7 +374,7 @@ def get_popular_players(players_data, h2h_connections, min_connections=10):
                 'height': data.get('height'),
                 'birth_year': data.get('birth_year'),
                 'titles': data.get('titles', 0),
-                'connections': len(h2h_connections[player_id])
+                'connections': opponent_counts[player_id]
             }
             popular_players.append(player_info)
     
@@ -304,31 +384,24 @@ def get_popular_players(players_data, h2h_connections, min_connections=10):
     print(f"Found {len(popular_players)} players with {min_connections}+ connections")
     return popular_players
 
-def build_connection_graph(h2h_connections, attribute_connections, tournament_connections):
-    """Build the final connection graph combining all connection types."""
+def build_connection_graph(player_ids, h2h_connections, attribute_connections, tournament_connections):
+    """Build the final connection graph of the given players combining all connection types."""
     print("Building final connection graph...")
     
     connection_graph = {}
     
-    all_player_ids = set()
-    all_player_ids.update(h2h_connections.keys())
-    all_player_ids.update(attribute_connections.keys())
-    all_player_ids.update(tournament_connections.keys())
-    
-    for player_id in all_player_ids:
+    for player_id in player_ids:
         connections = {
-            'direct_opponents': list(h2h_connections.get(player_id, [])),
-            'same_country': attribute_connections.get(player_id, {}).get('same_country', []),
-            'same_hand': attribute_connections.get(player_id, {}).get('same_hand', []),
-            'similar_height': attribute_connections.get(player_id, {}).get('similar_height', []),
-            'same_birth_year': attribute_connections.get(player_id, {}).get('same_birth_year', []),
-            'same_tournament': tournament_connections.get(player_id, {}).get('same_tournament', [])
+            'direct_opponents': h2h_connections.get(player_id, NO_PLAYERS),
+            'same_country': attribute_connections['same_country'].get(player_id, NO_PLAYERS),
+            'same_hand': attribute_connections['same_hand'].get(player_id, NO_PLAYERS),
+            'similar_height': attribute_connections['similar_height'].get(player_id, NO_PLAYERS),
+            'same_birth_year': attribute_connections['same_birth_year'].get(player_id, NO_PLAYERS),
+            'same_tournament': tournament_connections.get(player_id, {}).get('same_tournament', NO_PLAYERS)
         }
         
-        # Calculate total unique connections
-        all_connections = set()
-        for connection_type, connected_players in connections.items():
-            all_connections.update(connected_players)
+        # Calculate total unique connections (shared attribute groups list the player too)
+        all_connections = np.setdiff1d(np.concatenate(list(connections.values())), [player_id])
         
         connections['total_connections'] = len(all_connections)
         connection_graph[player_id] = connections
@@ -349,26 +422,36 @@ def main():
         print("Error: No match data loaded. Cannot continue.")
         return
     
-    # Extract connections
-    h2h_connections, match_details = extract_head_to_head_connections(matches_df, players_data)
-    attribute_connections = extract_attribute_connections(players_data)
-    tournament_connections = extract_tournament_connections(matches_df, gs_finals)
-    
-    # Build final graph
-    connection_graph = build_connection_graph(h2h_connections, attribute_connections, tournament_connections)
-    
-    # Get popular players for the game
-    popular_players = get_popular_players(players_data, h2h_connections, min_connections=8)
+    # Get popular players for the game, ranked by their number of distinct
+    # opponents, before building any connections
+    opponent_counts = count_opponents(matches_df)
+    popular_players = get_popular_players(players_data, opponent_counts, min_connections=8)
     
     # Focus on top players only to reduce data size
     top_players = popular_players[:800]  # Top 800 most connected players
     top_player_ids = {player['id'] for player in top_players}
     
+    # Extract connections (only the top players' are written)
+    h2h_connections = extract_head_to_head_connections(matches_df, top_player_ids)
+    attribute_connections = extract_attribute_connections(players_data)
+    tournament_connections = extract_tournament_connections(matches_df, gs_finals, top_player_ids)
+    
+    # Build final graph
+    connection_graph = build_connection_graph(top_player_ids, h2h_connections, attribute_connections, tournament_connections)
+    
+    # Match details are only needed for the top players (max 50 matches per player)
+    match_details = extract_match_details(matches_df, top_player_ids, max_matches=50)
+    
     # Filter connections to only include top players
     filtered_connections = {}
     for player_id in top_player_ids:
         if player_id in connection_graph:
-            filtered_connections[str(player_id)] = connection_graph[player_id]
+            connections = dict(connection_graph[player_id])
+            # Only now give each written player its own attribute lists without itself
+            for connection_type in ATTRIBUTE_CONNECTION_TYPES:
+                group = connections[connection_type]
+                connections[connection_type] = group[group != player_id]
+            filtered_connections[str(player_id)] = connections
     
     # Filter player details and match details for top players only
     filtered_player_details = {}
@@ -377,8 +460,7 @@ def main():
         if player_id in players_data and isinstance(players_data[player_id], dict):
             filtered_player_details[str(player_id)] = players_data[player_id]
         if player_id in match_details:
-            # Limit match details to avoid huge data
-            filtered_match_details[str(player_id)] = match_details[player_id][:50]  # Max 50 matches per player
+            filtered_match_details[str(player_id)] = match_details[player_id]
     
     # Prepare final data structure
     tennis_web_data = {
@@ -404,8 +486,9 @@ def main():
     
     # Save the data
     output_file = 'tennis_web_connections.json'
-    with open(output_file, 'w') as f:
-        json.dump(tennis_web_data, f, indent=2, cls=CustomJSONEncoder)
+    # Compact output: the file is only fetched by tennis-web.html (and compressed
+    # when served). NumPy scalars (and NaN, as null) are serialized natively by orjson
+    Path(output_file).write_bytes(orjson.dumps(tennis_web_data, option=orjson.OPT_SERIALIZE_NUMPY))
     
     print(f"\nData processing complete!")
     print(f"Saved {len(tennis_web_data['players'])} players to {output_file}")
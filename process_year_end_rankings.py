@@ -6,9 +6,21 @@ Creates a JSON file for the top 10 guessing game.
 
 import csv
 import json
-from collections import defaultdict
 from datetime import datetime
 import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+
+# Columns (and their types) read from the ranking files; dates stay strings
+# (YYYYMMDD) as they appear in the output
+RANKING_SCHEMA = pa.schema([
+    ('ranking_date', pa.string()),
+    ('rank', pa.int32()),
+    ('player', pa.string()),
+    ('points', pa.int64())
+])
 
 def load_players():
     """Load player information from atp_players.csv"""
@@ -39,44 +51,31 @@ def load_players():
     return players
 
 def load_rankings_from_file(filename):
-    """Load rankings from a specific CSV file"""
-    rankings = defaultdict(dict)
-    
+    """Load the ranking dates and the top 10 rankings from a specific CSV file"""
     print(f"Loading rankings from {filename}...")
     
-    with open(filename, 'r', encoding='utf-8', errors='ignore') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            date = row['ranking_date']
-            rank = int(row['rank'])
-            player_id = row['player']
-            points = int(row['points']) if row['points'] else 0
-            
-            # Store only if this is a better (lower) rank for this player on this date
-            if date not in rankings or rank not in rankings[date]:
-                rankings[date][rank] = {
-                    'player_id': player_id,
-                    'points': points
-                }
-    
-    print(f"Loaded rankings for {len(rankings)} dates from {filename}")
-    return rankings
-
-def get_year_end_rankings(rankings, year):
-    """Get the last ranking of the year for the given year"""
-    year_str = str(year)
-    year_dates = []
+    table = pv.read_csv(
+        filename,
+        convert_options=pv.ConvertOptions(include_columns=RANKING_SCHEMA.names, column_types=RANKING_SCHEMA)
+    )
+    dates = set(pc.unique(table['ranking_date']).to_pylist())
+    
+    # Only the top 10 is ever used, so drop the rest before leaving Arrow
+    rankings = table.filter(pc.field('rank') <= 10).to_pandas()
+    rankings['points'] = rankings['points'].fillna(0).astype('int64')
     
-    # Find all dates for this year
-    for date in rankings.keys():
-        if date.startswith(year_str):
-            year_dates.append(date)
+    # Keep the first entry for each rank on each date
+    rankings = rankings.drop_duplicates(subset=['ranking_date', 'rank'])
     
-    if not year_dates:
+    print(f"Loaded rankings for {len(dates)} dates from {filename}")
+    return dates, rankings
+
+def get_year_end_rankings(rankings, year_end_dates, year):
+    """Get the last ranking of the year for the given year"""
+    latest_date = year_end_dates.get(str(year))
+    if latest_date is None:
         return None
     
-    # Get the latest date in the year
-    latest_date = max(year_dates)
     year_end_ranking = rankings[latest_date]
     
     # Get top 10 only
@@ -95,7 +94,8 @@ def process_all_rankings():
     players = load_players()
     
     # Load rankings from all files
-    all_rankings = defaultdict(dict)
+    all_dates = set()
+    file_rankings = []
     
     ranking_files = [
         'tennis_atp-master/atp_rankings_00s.csv',
@@ -106,17 +106,35 @@ def process_all_rankings():
     
     for filename in ranking_files:
         if os.path.exists(filename):
-            file_rankings = load_rankings_from_file(filename)
-            # Merge with all_rankings
-            for date, date_rankings in file_rankings.items():
-                all_rankings[date].update(date_rankings)
+            dates, rankings = load_rankings_from_file(filename)
+            all_dates.update(dates)
+            file_rankings.append(rankings)
+    
+    # Merge into one date -> rank -> entry mapping; later files win for the same date and rank
+    all_rankings = {date: {} for date in all_dates}
+    if file_rankings:
+        top_rankings = pd.concat(file_rankings).drop_duplicates(subset=['ranking_date', 'rank'], keep='last')
+        for date, rank, player_id, points in zip(
+            top_rankings['ranking_date'].tolist(),
+            top_rankings['rank'].tolist(),
+            top_rankings['player'].tolist(),
+            top_rankings['points'].tolist()
+        ):
+            all_rankings[date][rank] = {
+                'player_id': player_id,
+                'points': points
+            }
+    
+    # Latest ranking date of every year, found in one pass over the dates
+    dates = pd.Series(list(all_rankings), dtype=str)
+    year_end_dates = dates.groupby(dates.str[:4]).max().to_dict()
     
     # Extract year-end top 10 for each year from 2000 to 2024
     year_end_data = {}
     
     for year in range(2000, 2025):
         print(f"Processing year {year}...")
-        year_data = get_year_end_rankings(all_rankings, year)
+        year_data = get_year_end_rankings(all_rankings, year_end_dates, year)
         
         if year_data:
             # Add player names and details